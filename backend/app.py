@@ -1,15 +1,95 @@
-from flask import Flask, send_file, jsonify, request
+from flask import Flask, send_file, jsonify, request, g
+import hmac
 import os
 import threading
+import time
+from config_loader import load_config
 from scheduler import start_scheduler, favorite_scrape_event, scrape_specific_chapter, scrape_manga_full, SCRAPED_DATA_FILE, FAVORITES_FILE
 import scheduler
+import catalog_snapshot
+import thumbnails
+import profiling
 
 app = Flask(__name__)
 
+# Header enabling per-request timing: any value adds a Server-Timing header,
+# "profile" additionally runs the request under cProfile and stores the result
+# (admin only; other callers just get the timing).
+REQUEST_TIMING_HEADER = 'X-Request-Timing'
+
+def scheduler_enabled():
+    """The SCHEDULER_ENABLED environment variable overrides scraping.scheduler_enabled, so replicas sharing one config can differ."""
+    env_value = os.environ.get('SCHEDULER_ENABLED')
+    if env_value is not None:
+        return env_value.lower() not in ('0', 'false', 'no')
+    return load_config().get('scraping', {}).get('scheduler_enabled', True)
+
+def _no_scraper_response():
+    """API-only node without a work table: nothing here may scrape or write the catalog."""
+    return jsonify({"error": "No scheduler or work table is available on this node."}), 503
+
+def _admin_authorized():
+    """Admin routes and request profiling stay disabled until profiling.admin_token is set."""
+    token = profiling.get_profiling_settings().get('admin_token')
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+def _admin_error():
+    """Error response for an /admin route, or None if the caller may use it."""
+    if not profiling.get_profiling_settings().get('admin_token'):
+        return jsonify({"error": "Admin routes are disabled. Set profiling.admin_token to enable them."}), 404
+    if not _admin_authorized():
+        return jsonify({"error": "Unauthorized"}), 401
+    return None
+
+# --- Request Timing ---
+@app.before_request
+def start_request_timing():
+    mode = request.headers.get(REQUEST_TIMING_HEADER)
+    if not mode:
+        return
+    g.request_timing_start = time.perf_counter()
+    if mode == 'profile' and _admin_authorized():
+        # None when another profile is running; the request then only gets Server-Timing.
+        g.request_profiler = profiling.start_profiler()
+
+@app.after_request
+def finish_request_timing(response):
+    start = g.pop('request_timing_start', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    profiler = g.pop('request_profiler', None)
+    if profiler is not None:
+        profiling.stop_profiler(profiler)
+        name = profiling.write_profile(f"request_{request.endpoint}", profiler, elapsed=elapsed)
+        response.headers['X-Profile-Name'] = name
+    response.headers['Server-Timing'] = f"app;dur={elapsed * 1000:.1f}"
+    return response
+
+@app.teardown_request
+def release_request_profiler(exc):
+    # after_request is skipped when a view raises, so the profiling slot is released here.
+    profiler = g.pop('request_profiler', None)
+    if profiler is not None:
+        profiling.stop_profiler(profiler)
+
+@app.errorhandler(catalog_snapshot.SnapshotError)
+def catalog_unavailable(e):
+    """No usable snapshot and the JSON catalog cannot be parsed."""
+    print(f"Catalog unavailable: {e}")
+    return jsonify({"error": "Catalog is temporarily unavailable."}), 503
+
 # --- Flask Routes ---
 @app.route('/')
 def status():
     """Provides a status update of the scraper."""
+    try:
+        snapshot = scheduler.get_catalog_snapshot()
+        catalog_size, catalog_error = len(snapshot) if snapshot else 0, None
+    except catalog_snapshot.SnapshotError as e:
+        catalog_size, catalog_error = None, str(e)
+    work_table = scheduler.get_work_table()
     return jsonify({
         "status": "Server running",
         "scraper_running": scheduler.is_scraper_running,
@@ -17,9 +97,28 @@ def status():
         "last_scrape_time": scheduler.last_scrape_time,
         "next_scrape_time": scheduler.next_scrape_time,
         "data_file": SCRAPED_DATA_FILE,
-        "favorites_file": FAVORITES_FILE
+        "catalog_size": catalog_size,
+        "catalog_error": catalog_error,
+        "favorites_file": FAVORITES_FILE,
+        "work_units": work_table.counts() if work_table else None
     })
 
+@app.route('/api/manga')
+def api_manga_list():
+    """Lists all mangas without their chapters, read from the catalog snapshot."""
+    snapshot = scheduler.get_catalog_snapshot()
+    if snapshot is None:
+        return jsonify([])
+    return jsonify(list(snapshot.summaries()))
+
+@app.route('/api/manga/<manga_id>')
+def api_manga_detail(manga_id):
+    """Returns a single manga with its chapters, decoded from the catalog snapshot."""
+    manga_entry = scheduler.get_manga_entry(manga_id)
+    if manga_entry is None:
+        return jsonify({"error": "Manga not found."}), 404
+    return jsonify(manga_entry)
+
 @app.route('/download_data')
 def download_data():
     """Allows downloading of the main scraped data JSON file."""
@@ -28,14 +127,34 @@ def download_data():
     else:
         return jsonify({"error": "Data file not found. Please wait for the scraper to run or check file path."}), 404
 
+@app.route('/thumbnails/<name>')
+def serve_thumbnail(name):
+    """Serves a generated thumbnail. File names are content hashes, so they never change."""
+    path = thumbnails.thumbnail_path(name)
+    if not path or not os.path.exists(path):
+        return jsonify({"error": "Thumbnail not found."}), 404
+    thumbnails.touch_thumbnail(path)
+    response = send_file(path, mimetype=thumbnails.thumbnail_mimetype(name), conditional=True)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 @app.route('/trigger_favorites_update', methods=['POST'])
 def trigger_favorites_update():
     """
     Endpoint to manually trigger an immediate scrape of favorite mangas.
     """
-    favorite_scrape_event.set()
-    print("Received request to trigger immediate favorites update.")
-    return jsonify({"message": "Immediate favorites scrape triggered. Check scraper logs for progress."}), 200
+    if scheduler.scheduler_running:
+        favorite_scrape_event.set()
+        print("Received request to trigger immediate favorites update.")
+        return jsonify({"message": "Immediate favorites scrape triggered. Check scraper logs for progress."}), 200
+
+    work_table = scheduler.get_work_table()
+    if work_table is None:
+        return _no_scraper_response()
+    scraping_config = load_config().get('scraping', {})
+    scheduler.enqueue_favorite_units(work_table, max_chapters_per_manga=scraping_config.get('max_chapters_per_manga', 1),
+                                     grab_all_chapters=scraping_config.get('grab_all_chapters_favorites', False))
+    return jsonify({"message": "Favorites queued for workers."}), 202
 
 @app.route('/api/scrape_chapter', methods=['POST'])
 def api_scrape_chapter():
@@ -46,6 +165,18 @@ def api_scrape_chapter():
     if not manga_id or not chapter_id:
         return jsonify({"error": "Missing mangaId or chapterId"}), 400
 
+    work_table = scheduler.get_work_table()
+    if work_table is not None:
+        manga_entry = scheduler.get_manga_entry(manga_id)
+        chapter_entry = next((c for c in (manga_entry or {}).get('chapters', []) if c['id'] == chapter_id), None)
+        if chapter_entry is None:
+            return jsonify({"error": "Chapter not found."}), 404
+        if not scheduler.enqueue_chapter_unit(work_table, manga_id, chapter_entry):
+            return jsonify({"message": "This chapter is already queued for workers."}), 200
+        return jsonify({"message": "Chapter scrape queued for workers."}), 202
+    if not scheduler.scheduler_running:
+        return _no_scraper_response()
+
     def run_task():
         print(f"Starting background scrape for chapter {chapter_id} of manga {manga_id}")
         success = scrape_specific_chapter(manga_id, chapter_id)
@@ -65,6 +196,17 @@ def api_scrape_manga():
     if not manga_id:
         return jsonify({"error": "Missing mangaId"}), 400
 
+    work_table = scheduler.get_work_table()
+    if work_table is not None:
+        manga_entry = scheduler.get_manga_entry(manga_id)
+        if manga_entry is None:
+            return jsonify({"error": "Manga not found."}), 404
+        if not scheduler.enqueue_manga_unit(work_table, manga_entry['url']):
+            return jsonify({"message": "A scrape of this manga is already in progress."}), 200
+        return jsonify({"message": "Full manga scrape queued for workers."}), 202
+    if not scheduler.scheduler_running:
+        return _no_scraper_response()
+
     def run_task():
         print(f"Starting background full scrape for manga {manga_id}")
         success = scrape_manga_full(manga_id)
@@ -76,8 +218,66 @@ def api_scrape_manga():
     threading.Thread(target=run_task).start()
     return jsonify({"message": "Full manga scrape started in background."}), 202
 
+# --- Profiling Routes ---
+@app.route('/admin/profile/cycle', methods=['POST'])
+def admin_profile_cycle():
+    """Arms cProfile and the stack sampler for the next scheduler cycle."""
+    error = _admin_error()
+    if error:
+        return error
+    if not scheduler.scheduler_running:
+        return jsonify({"error": "No scheduler runs in this process."}), 503
+    profiling.cycle_profile_event.set()
+    return jsonify({"message": "Next scheduler cycle will be profiled.", "next_scrape_time": scheduler.next_scrape_time}), 202
+
+@app.route('/admin/profile/scrape_manga', methods=['POST'])
+def admin_profile_scrape_manga():
+    """Runs a full manga scrape in the background under the profiler."""
+    error = _admin_error()
+    if error:
+        return error
+    data = request.json or {}
+    manga_id = data.get('mangaId')
+
+    if not manga_id:
+        return jsonify({"error": "Missing mangaId"}), 400
+    # The scrape runs and saves in-process, which only the node that owns the catalog may do.
+    if not scheduler.scheduler_running or scheduler.get_work_table() is not None:
+        return jsonify({"error": "Manga scrapes do not run in this process."}), 503
+
+    if profiling.profiler_busy():
+        return jsonify({"error": "Another profile is running."}), 409
+
+    def run_task():
+        print(f"Starting profiled full scrape for manga {manga_id}")
+        profiling.run_profiled(f"scrape_manga_{manga_id}", scrape_manga_full, manga_id)
+
+    threading.Thread(target=run_task).start()
+    return jsonify({"message": "Profiled manga scrape started in background."}), 202
+
+@app.route('/admin/profiles')
+def admin_list_profiles():
+    error = _admin_error()
+    if error:
+        return error
+    return jsonify(profiling.list_profiles())
+
+@app.route('/admin/profiles/<file_name>')
+def admin_download_profile(file_name):
+    error = _admin_error()
+    if error:
+        return error
+    path = profiling.profile_file_path(file_name)
+    if not path:
+        return jsonify({"error": "Profile not found."}), 404
+    mimetype = 'application/octet-stream' if file_name.endswith('.prof') else 'text/plain'
+    return send_file(path, as_attachment=True, download_name=file_name, mimetype=mimetype)
+
 if __name__ == "__main__":
     print("Starting Manga Scraper Backend...")
-    start_scheduler()
+    if scheduler_enabled():
+        start_scheduler()
+    else:
+        print("Scheduler disabled, running as API node only.")
     print("Flask server starting on http://127.0.0.1:5000")
     app.run(host='0.0.0.0', port=5000, debug=False)
@@ -0,0 +1,312 @@
+"""
+Read-optimised binary snapshot of the scraped catalog.
+
+The snapshot is written next to the JSON catalog on every save and opened with mmap,
+so single records can be decoded without parsing the whole catalog.
+
+Layout (little-endian):
+    header          HEADER
+    string index    string_count x STRING_ENTRY (offset into string data, byte length)
+    string data     UTF-8 bytes of every distinct string
+    manga index     record_count x INDEX_ENTRY (id string, record offset), sorted by id
+    records         per manga: MANGA_FIELDS string ids, extras string id, list counts,
+                    alt_titles/genres string ids, then per chapter: CHAPTER_FIELDS
+                    string ids, extras string id, image count and image string ids
+
+Known fields are stored as string ids when their value is a string (lists: when all
+items are strings). Anything else goes into a per-record JSON "extras" string, so a
+snapshot always decodes back to exactly the dicts it was written from.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+
+SNAPSHOT_MAGIC = b'MHCATSNP'
+SNAPSHOT_VERSION = 1
+NONE = 0xFFFFFFFF # Missing string / missing list
+
+MANGA_FIELDS = ('id', 'url', 'title', 'cover', 'cover_thumb', 'genre_type', 'description', 'status',
+                'author', 'artist', 'latest_chapter_title', 'latest_chapter_url')
+MANGA_LIST_FIELDS = ('alt_titles', 'genres')
+CHAPTER_FIELDS = ('id', 'title', 'url', 'date', 'thumb')
+
+# magic, version, flags, record_count, string_count, generation,
+# string_index_offset, string_data_offset, manga_index_offset
+HEADER = struct.Struct('<8sHHIIQQQQ')
+STRING_ENTRY = struct.Struct('<QI')
+INDEX_ENTRY = struct.Struct('<IQ')
+MANGA_HEADER = struct.Struct('<' + 'I' * (len(MANGA_FIELDS) + 1 + len(MANGA_LIST_FIELDS) + 1))
+CHAPTER_HEADER = struct.Struct('<' + 'I' * (len(CHAPTER_FIELDS) + 1 + 1))
+STRING_ID = struct.Struct('<I')
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or of an unsupported version."""
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return NONE
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = len(self.strings)
+            self.ids[value] = sid
+            self.strings.append(value)
+        return sid
+
+def _split_fields(item, fields, list_fields=()):
+    """Returns (string values per field, string lists per list field, extras dict)."""
+    extras = {}
+    values = []
+    for field in fields:
+        value = item.get(field)
+        if isinstance(value, str):
+            values.append(value)
+        else:
+            values.append(None)
+            if field in item:
+                extras[field] = value
+    lists = []
+    for field in list_fields:
+        value = item.get(field)
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            lists.append(value)
+        else:
+            lists.append(None)
+            if field in item:
+                extras[field] = value
+    known = set(fields) | set(list_fields) | {'chapters'}
+    for key, value in item.items():
+        if key not in known:
+            extras[key] = value
+    return values, lists, extras
+
+def _encode_record(manga, strings):
+    values, lists, extras = _split_fields(manga, MANGA_FIELDS, MANGA_LIST_FIELDS)
+    chapters = manga.get('chapters')
+    if not isinstance(chapters, list):
+        if 'chapters' in manga:
+            extras['chapters'] = chapters
+        chapters = None
+
+    header_values = [strings.add(v) for v in values]
+    header_values.append(strings.add(json.dumps(extras, ensure_ascii=False)) if extras else NONE)
+    header_values.extend(len(l) if l is not None else NONE for l in lists)
+    header_values.append(len(chapters) if chapters is not None else NONE)
+
+    parts = [MANGA_HEADER.pack(*header_values)]
+    for l in lists:
+        for v in l or ():
+            parts.append(STRING_ID.pack(strings.add(v)))
+
+    for chapter in chapters or ():
+        chapter_values, chapter_lists, chapter_extras = _split_fields(chapter, CHAPTER_FIELDS, ('images',))
+        images = chapter_lists[0]
+        parts.append(CHAPTER_HEADER.pack(
+            *[strings.add(v) for v in chapter_values],
+            strings.add(json.dumps(chapter_extras, ensure_ascii=False)) if chapter_extras else NONE,
+            len(images) if images is not None else NONE
+        ))
+        for v in images or ():
+            parts.append(STRING_ID.pack(strings.add(v)))
+    return b''.join(parts)
+
+def _read_generation(path):
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) == HEADER.size:
+            fields = HEADER.unpack(header)
+            if fields[0] == SNAPSHOT_MAGIC:
+                return fields[5]
+    except OSError:
+        pass
+    return 0
+
+def write_snapshot(mangas, path):
+    """
+    Writes mangas (the list saved to the JSON catalog) as a snapshot at path.
+    The file is written under a temporary name and swapped in with os.replace,
+    so readers only ever see a complete old or a complete new snapshot.
+    """
+    strings = _StringTable()
+    records_by_id = {}
+    for manga in mangas:
+        records_by_id[str(manga.get('id'))] = manga
+
+    ordered_ids = sorted(records_by_id)
+    id_string_ids = [strings.add(manga_id) for manga_id in ordered_ids]
+    encoded_records = [_encode_record(records_by_id[manga_id], strings) for manga_id in ordered_ids]
+
+    encoded_strings = [s.encode('utf-8') for s in strings.strings]
+    string_index_offset = HEADER.size
+    string_data_offset = string_index_offset + STRING_ENTRY.size * len(encoded_strings)
+    string_data_size = sum(len(s) for s in encoded_strings)
+    manga_index_offset = string_data_offset + string_data_size
+    records_offset = manga_index_offset + INDEX_ENTRY.size * len(encoded_records)
+
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(encoded_records), len(encoded_strings),
+                         _read_generation(path) + 1, string_index_offset, string_data_offset, manga_index_offset)
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        offset = 0
+        for s in encoded_strings:
+            f.write(STRING_ENTRY.pack(offset, len(s)))
+            offset += len(s)
+        for s in encoded_strings:
+            f.write(s)
+        offset = records_offset
+        for sid, record in zip(id_string_ids, encoded_records):
+            f.write(INDEX_ENTRY.pack(sid, offset))
+            offset += len(record)
+        for record in encoded_records:
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class CatalogSnapshot:
+    """Lazily decoded, mmap-backed view of a snapshot file."""
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}")
+
+        if len(self._mm) < HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        (magic, version, _flags, self.record_count, self.string_count, self.generation,
+         self._string_index_offset, self._string_data_offset, self._manga_index_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path} is not a catalog snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version} in {path}")
+        if self._manga_index_offset + INDEX_ENTRY.size * self.record_count > len(self._mm):
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+    def __len__(self):
+        return self.record_count
+
+    def __contains__(self, manga_id):
+        return self._find(manga_id) is not None
+
+    def _string(self, sid):
+        if sid == NONE:
+            return None
+        offset, length = STRING_ENTRY.unpack_from(self._mm, self._string_index_offset + sid * STRING_ENTRY.size)
+        start = self._string_data_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _index_entry(self, i):
+        return INDEX_ENTRY.unpack_from(self._mm, self._manga_index_offset + i * INDEX_ENTRY.size)
+
+    def _find(self, manga_id):
+        """Binary search over the sorted manga index. Returns the record offset or None."""
+        manga_id = str(manga_id)
+        lo, hi = 0, self.record_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sid, record_offset = self._index_entry(mid)
+            key = self._string(sid)
+            if key == manga_id:
+                return record_offset
+            if key < manga_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _read_string_ids(self, offset, count):
+        ids = struct.unpack_from(f'<{count}I', self._mm, offset)
+        return [self._string(sid) for sid in ids], offset + count * STRING_ID.size
+
+    def _decode_record(self, offset, with_chapters=True):
+        header = MANGA_HEADER.unpack_from(self._mm, offset)
+        offset += MANGA_HEADER.size
+        n = len(MANGA_FIELDS)
+        field_ids, extras_id = header[:n], header[n]
+        list_counts = header[n + 1:n + 1 + len(MANGA_LIST_FIELDS)]
+        chapter_count = header[-1]
+
+        manga = {}
+        for field, sid in zip(MANGA_FIELDS, field_ids):
+            if sid != NONE:
+                manga[field] = self._string(sid)
+        for field, count in zip(MANGA_LIST_FIELDS, list_counts):
+            if count != NONE:
+                manga[field], offset = self._read_string_ids(offset, count)
+
+        if with_chapters and chapter_count != NONE:
+            chapters = []
+            for _ in range(chapter_count):
+                chapter_header = CHAPTER_HEADER.unpack_from(self._mm, offset)
+                offset += CHAPTER_HEADER.size
+                chapter = {}
+                for field, sid in zip(CHAPTER_FIELDS, chapter_header):
+                    if sid != NONE:
+                        chapter[field] = self._string(sid)
+                image_count = chapter_header[-1]
+                if image_count != NONE:
+                    chapter['images'], offset = self._read_string_ids(offset, image_count)
+                chapter_extras_id = chapter_header[len(CHAPTER_FIELDS)]
+                if chapter_extras_id != NONE:
+                    chapter.update(json.loads(self._string(chapter_extras_id)))
+                chapters.append(chapter)
+            manga['chapters'] = chapters
+
+        if extras_id != NONE:
+            extras = json.loads(self._string(extras_id))
+            if not with_chapters:
+                extras.pop('chapters', None)
+            manga.update(extras)
+        return manga
+
+    def _decode_checked(self, offset, with_chapters=True):
+        try:
+            return self._decode_record(offset, with_chapters)
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise SnapshotError(f"Snapshot {self.path} is corrupt: {e}")
+
+    def get(self, manga_id):
+        """Returns the full record for manga_id, or None."""
+        offset = self._find(manga_id)
+        return self._decode_checked(offset) if offset is not None else None
+
+    def ids(self):
+        for i in range(self.record_count):
+            yield self._string(self._index_entry(i)[0])
+
+    def summaries(self):
+        """Yields every record without its chapters."""
+        for i in range(self.record_count):
+            yield self._decode_checked(self._index_entry(i)[1], with_chapters=False)
+
+    def close(self):
+        self._mm.close()
+
+_open_snapshots = {}
+_open_snapshots_lock = threading.Lock()
+
+def open_snapshot(path):
+    """
+    Returns a CatalogSnapshot for path, reusing the open mapping until the file is
+    replaced. Readers holding an older snapshot keep a valid mapping of the old file.
+    """
+    stat = os.stat(path)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _open_snapshots_lock:
+        cached = _open_snapshots.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        snapshot = CatalogSnapshot(path)
+        _open_snapshots[path] = (key, snapshot)
+        return snapshot
@@ -0,0 +1,174 @@
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+try:
+    from .config_loader import load_config
+except ImportError:
+    from config_loader import load_config
+
+# Paths
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), 'profiles')
+
+# Each session writes <name>.prof (pstats), <name>.txt (top functions) and <name>.folded (collapsed stacks)
+PROFILE_EXTENSIONS = ('.prof', '.txt', '.folded')
+
+DEFAULT_PROFILING_SETTINGS = {
+    "max_profiles": 20,
+    "sample_interval_ms": 5,
+    "admin_token": ""
+}
+
+# Global state
+cycle_profile_event = threading.Event() # Set to profile the next scheduler cycle
+profile_lock = threading.Lock()
+active_profiler_lock = threading.Lock() # cProfile allows one active profiler per process (3.12+)
+
+def get_profiling_settings():
+    settings = dict(DEFAULT_PROFILING_SETTINGS)
+    settings.update(load_config().get('profiling', {}))
+    return settings
+
+class StackSampler:
+    """
+    Lightweight sampling profiler. Periodically captures the stack of one thread
+    and counts collapsed stacks, which can be fed to flamegraph.pl or speedscope.
+    """
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def _session_name(label):
+    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    safe_label = ''.join(c if c.isalnum() or c in '-_' else '_' for c in label)
+    return f"{timestamp}_{safe_label}"
+
+def write_profile(label, profiler, sampler=None, elapsed=None):
+    """Dumps a finished profiler (and optional sampler) to PROFILE_DIR and prunes old sessions."""
+    name = _session_name(label)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, name)
+
+    profiler.dump_stats(base + '.prof')
+
+    summary = io.StringIO()
+    if elapsed is not None:
+        summary.write(f"{label}: {elapsed:.3f}s wall time\n\n")
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(50)
+    with open(base + '.txt', 'w', encoding='utf-8') as f:
+        f.write(summary.getvalue())
+
+    if sampler is not None:
+        with open(base + '.folded', 'w', encoding='utf-8') as f:
+            f.write(sampler.collapsed())
+
+    prune_profiles()
+    print(f"Profile written: {name}")
+    return name
+
+def start_profiler():
+    """
+    Claims the process's single profiling slot and returns an enabled cProfile.Profile,
+    or None if another profile is running. Pass the profiler to stop_profiler when done.
+    """
+    if not active_profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e: # Another profiling tool is active
+        active_profiler_lock.release()
+        print(f"Profiler unavailable: {e}")
+        return None
+    return profiler
+
+def stop_profiler(profiler):
+    profiler.disable()
+    active_profiler_lock.release()
+
+def profiler_busy():
+    return active_profiler_lock.locked()
+
+def run_profiled(label, func, *args, **kwargs):
+    """
+    Runs func under cProfile and the stack sampler, writing the results to disk. If another
+    profile is already running, func runs unprofiled.
+    """
+    settings = get_profiling_settings()
+    profiler = start_profiler()
+    if profiler is None:
+        print(f"Another profile is running, running {label} without profiling.")
+        return func(*args, **kwargs)
+
+    sampler = StackSampler(threading.get_ident(), settings['sample_interval_ms'] / 1000.0)
+    start = time.perf_counter()
+    try:
+        sampler.start()
+        return func(*args, **kwargs)
+    finally:
+        stop_profiler(profiler)
+        sampler.stop()
+        write_profile(label, profiler, sampler, time.perf_counter() - start)
+
+def list_profiles():
+    """Returns the stored profile sessions, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    sessions = {}
+    for file_name in os.listdir(PROFILE_DIR):
+        name, ext = os.path.splitext(file_name)
+        if ext in PROFILE_EXTENSIONS:
+            sessions.setdefault(name, []).append(file_name)
+    return [{"name": name, "files": sorted(sessions[name])} for name in sorted(sessions, reverse=True)]
+
+def prune_profiles(max_profiles=None):
+    if max_profiles is None:
+        max_profiles = get_profiling_settings()['max_profiles']
+    with profile_lock:
+        for session in list_profiles()[max_profiles:]:
+            for file_name in session['files']:
+                try:
+                    os.remove(os.path.join(PROFILE_DIR, file_name))
+                except OSError:
+                    pass
+
+def profile_file_path(file_name):
+    """Resolves a stored profile file name, rejecting anything outside PROFILE_DIR."""
+    if not file_name or file_name != os.path.basename(file_name):
+        return None
+    if os.path.splitext(file_name)[1] not in PROFILE_EXTENSIONS:
+        return None
+    path = os.path.join(PROFILE_DIR, file_name)
+    return path if os.path.exists(path) else None
@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import threading
+import time
+
+try:
+    from .config_loader import load_config
+except ImportError:
+    from config_loader import load_config
+
+# Paths
+RECOMMENDATION_POOL_FILE = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'public', 'recommendation_pool.json')
+
+DEFAULT_POOL_SETTINGS = {
+    "pool_size": 500,
+    "pages_per_cycle": 2,
+    "max_pages_per_genre": 20,
+    "freshness_hours": None
+}
+
+# Consecutive fetch failures of a listing page past page 1 before the genre starts over.
+MAX_LIST_PAGE_FAILURES = 2
+
+pool_lock = threading.Lock() # Lock for the pool file
+
+def get_pool_settings():
+    config = load_config()
+    settings = dict(DEFAULT_POOL_SETTINGS)
+    settings.update(config.get('recommendations', {}))
+    for key in ('pages_per_cycle', 'max_pages_per_genre'):
+        if not isinstance(settings[key], int) or settings[key] < 1:
+            print(f"Warning: recommendations.{key} must be at least 1, using {DEFAULT_POOL_SETTINGS[key]}.")
+            settings[key] = DEFAULT_POOL_SETTINGS[key]
+
+    # Candidates must outlive a full pass over the listing, or the early pages' candidates
+    # are pruned before the crawl comes back to them. Allow two passes for skipped cycles.
+    cycles_per_pass = -(-settings['max_pages_per_genre'] // settings['pages_per_cycle'])
+    min_freshness_hours = 2 * cycles_per_pass * config.get('scraping', {}).get('interval_hours', 8)
+    if settings['freshness_hours'] is None:
+        settings['freshness_hours'] = min_freshness_hours
+    elif settings['freshness_hours'] < min_freshness_hours:
+        print(f"Warning: recommendations.freshness_hours ({settings['freshness_hours']}) is shorter than two passes "
+              f"over the genre listings ({min_freshness_hours}h), using {min_freshness_hours}h. Lower max_pages_per_genre "
+              f"or raise pages_per_cycle for a shorter window.")
+        settings['freshness_hours'] = min_freshness_hours
+    return settings
+
+def load_pool():
+    """
+    Returns the candidate pool:
+    {"genres": {genre_url: {"next_page": int}},
+     "candidates": {manga_url: summary + "last_seen" and, once scraped, "scraped_latest_chapter_title"}}
+    """
+    with pool_lock:
+        if os.path.exists(RECOMMENDATION_POOL_FILE):
+            try:
+                with open(RECOMMENDATION_POOL_FILE, 'r', encoding='utf-8') as f:
+                    pool = json.load(f)
+                pool.setdefault('genres', {})
+                pool.setdefault('candidates', {})
+                return pool
+            except json.JSONDecodeError:
+                pass
+    return {'genres': {}, 'candidates': {}}
+
+def save_pool(pool):
+    with pool_lock:
+        tmp_file = RECOMMENDATION_POOL_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(pool, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_file, RECOMMENDATION_POOL_FILE)
+
+def genre_page_url(genre_url, page):
+    if page <= 1:
+        return genre_url
+    return f"{genre_url.rstrip('/')}/page/{page}/"
+
+def pages_to_crawl(pool, genre_url, settings):
+    """Listing pages of genre_url to fetch this cycle, continuing where the last cycle stopped."""
+    next_page = pool['genres'].get(genre_url, {}).get('next_page', 1)
+    pages = []
+    for _ in range(settings['pages_per_cycle']):
+        pages.append(next_page)
+        next_page = next_page + 1 if next_page < settings['max_pages_per_genre'] else 1
+        if next_page == pages[0]:
+            break
+    return pages
+
+def record_list_page(pool, genre_url, page, summaries, settings):
+    """
+    Adds a crawled listing page to the pool and moves the genre's cursor past it. An empty
+    page (or a missing one) means the end of the listing, so the next cycle starts again
+    from page 1. summaries is None when the page could not be fetched; the cursor then stays
+    put, unless a page past page 1 keeps failing.
+    """
+    genre_state = pool['genres'].setdefault(genre_url, {'next_page': 1})
+    if summaries is None:
+        genre_state['failures'] = genre_state.get('failures', 0) + 1
+        if page > 1 and genre_state['failures'] >= MAX_LIST_PAGE_FAILURES:
+            print(f"Listing page {page} of {genre_url} keeps failing, starting over from page 1.")
+            genre_state.update(next_page=1, failures=0)
+        return
+    genre_state['failures'] = 0
+    if not summaries or page >= settings['max_pages_per_genre']:
+        genre_state['next_page'] = 1
+    else:
+        genre_state['next_page'] = page + 1
+
+    now = time.time()
+    for summary in summaries:
+        if not summary.get('url') or summary['url'] == 'N/A':
+            continue
+        candidate = pool['candidates'].setdefault(summary['url'], {})
+        candidate.update({
+            'id': summary['id'],
+            'title': summary.get('title', 'N/A'),
+            'genre_type': summary.get('genre_type', 'N/A'),
+            'cover': summary.get('cover', 'N/A'),
+            'url': summary['url'],
+            'latest_chapter_title': summary.get('latest_chapter_title', 'N/A'),
+            'latest_chapter_url': summary.get('latest_chapter_url', 'N/A'),
+            'last_seen': now
+        })
+
+def prune_pool(pool, settings):
+    """Drops candidates not seen within the freshness window, then the oldest beyond pool_size."""
+    cutoff = time.time() - settings['freshness_hours'] * 3600
+    candidates = {url: c for url, c in pool['candidates'].items() if c.get('last_seen', 0) >= cutoff}
+    if len(candidates) > settings['pool_size']:
+        newest = sorted(candidates.values(), key=lambda c: c['last_seen'], reverse=True)[:settings['pool_size']]
+        candidates = {c['url']: c for c in newest}
+    pool['candidates'] = candidates
+
+def _has_new_data(candidate, existing_mangas_map):
+    existing = existing_mangas_map.get(candidate['id'])
+    if existing is None:
+        return True
+    listed = candidate.get('latest_chapter_title', 'N/A')
+    if listed == 'N/A':
+        return False
+    # Listing and detail pages may word chapter titles differently, so compare against what
+    # the listing said when the title was last scraped, falling back to the stored entry.
+    known = candidate.get('scraped_latest_chapter_title', existing.get('latest_chapter_title'))
+    return listed != known
+
+def pick_candidates(pool, existing_mangas_map, favorites_urls, num_recommendations, genre_type=None):
+    """
+    Randomly picks up to num_recommendations non-favorite candidates that would add data:
+    titles missing from the catalog, or listing a different latest chapter than when they
+    were last scraped. Candidates with nothing new are never picked.
+    """
+    eligible = [
+        c for c in pool['candidates'].values()
+        if c['url'] not in favorites_urls
+        and (not genre_type or c.get('genre_type') == genre_type)
+        and _has_new_data(c, existing_mangas_map)
+    ]
+    if len(eligible) > num_recommendations:
+        return random.sample(eligible, num_recommendations)
+    return eligible
+
+def mark_scraped(pool, manga_urls):
+    """Remembers the listed latest chapter of candidates whose detail page was just scraped."""
+    for manga_url in manga_urls:
+        candidate = pool['candidates'].get(manga_url)
+        if candidate:
+            candidate['scraped_latest_chapter_title'] = candidate.get('latest_chapter_title', 'N/A')
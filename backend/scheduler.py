@@ -1,19 +1,33 @@
 import threading
 import time
 import datetime
+import hashlib
 import json
 import os
-import random
 import re
+import tempfile
+import traceback
 
 try:
     from .config_loader import load_config
+    from . import catalog_snapshot
+    from . import profiling
+    from . import recommendation_pool
+    from . import thumbnails
+    from . import work_queue
     from .scraper.mangaread import MangaReadScraper
     from .scraper.ai_scraper import AIScraper
+    from .scraper.base import PageNotFound
 except ImportError:
     from config_loader import load_config
+    import catalog_snapshot
+    import profiling
+    import recommendation_pool
+    import thumbnails
+    import work_queue
     from scraper.mangaread import MangaReadScraper
     from scraper.ai_scraper import AIScraper
+    from scraper.base import PageNotFound
 
 # Global state
 last_scrape_time = "Never"
@@ -21,11 +35,21 @@ next_scrape_time = "N/A"
 is_scraper_running = False
 scraper_status_message = "Idle"
 favorite_scrape_event = threading.Event()
+work_table = None # Shared WorkTable when running in distributed mode
+work_table_lock = threading.Lock()
+scheduler_running = False # True once this process runs the scheduler loop
 data_file_lock = threading.Lock() # Lock for file access
 
 # Paths
 FRONTEND_PUBLIC_DIR = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'public')
 SCRAPED_DATA_FILE = os.path.join(FRONTEND_PUBLIC_DIR, 'scraped_manga_data_mangaread.json')
+SNAPSHOT_FILE = os.path.join(FRONTEND_PUBLIC_DIR, 'scraped_manga_data_mangaread.snapshot')
+# Snapshot rebuilt by processes that do not write the catalog (API nodes), outside the shared
+# volume. The name depends only on the catalog path, so restarts reuse the same file.
+LOCAL_SNAPSHOT_FILE = os.path.join(
+    tempfile.gettempdir(),
+    f"manhwa_catalog_{hashlib.sha256(os.path.abspath(SCRAPED_DATA_FILE).encode('utf-8')).hexdigest()[:16]}.snapshot"
+)
 FAVORITES_FILE = os.path.join(FRONTEND_PUBLIC_DIR, 'favorites.json')
 GENRE_URLS = [
     "https://www.mangaread.org/genres/manga/",
@@ -48,20 +72,82 @@ def load_favorites_urls():
             return []
     return []
 
+def _read_scraped_data():
+    """Parses the JSON catalog, raising on a missing or malformed file."""
+    with open(SCRAPED_DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 def load_scraped_data():
     with data_file_lock:
         if os.path.exists(SCRAPED_DATA_FILE):
             try:
-                with open(SCRAPED_DATA_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _read_scraped_data()
             except json.JSONDecodeError:
                 return []
     return []
 
 def save_scraped_data(data):
+    thumbnails.drop_evicted_references(data)
     with data_file_lock:
-        with open(SCRAPED_DATA_FILE, 'w', encoding='utf-8') as f:
+        # Readers in other processes (API nodes, the frontend) must never see a half-written file.
+        tmp_file = f"{SCRAPED_DATA_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_file, SCRAPED_DATA_FILE)
+        catalog_snapshot.write_snapshot(data, SNAPSHOT_FILE)
+
+def _open_fresh_snapshot(path):
+    """Opens the snapshot at path if it is at least as new as the JSON catalog, else returns None."""
+    try:
+        if os.path.getmtime(path) >= os.path.getmtime(SCRAPED_DATA_FILE):
+            return catalog_snapshot.open_snapshot(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, catalog_snapshot.SnapshotError) as e:
+        print(f"Catalog snapshot {path} unavailable ({e}).")
+    return None
+
+def get_catalog_snapshot():
+    """
+    Returns the mmap-backed catalog snapshot, or None if there is no catalog yet.
+    The snapshot is rebuilt from the JSON file if it is missing, unreadable or older. Only
+    the process running the scheduler replaces the shared snapshot; others rebuild a private
+    copy. If the JSON cannot be parsed, the previous snapshot is served instead.
+    """
+    if not os.path.exists(SCRAPED_DATA_FILE):
+        return None
+    snapshot = _open_fresh_snapshot(SNAPSHOT_FILE)
+    if snapshot is None and not scheduler_running:
+        snapshot = _open_fresh_snapshot(LOCAL_SNAPSHOT_FILE)
+    if snapshot is not None:
+        return snapshot
+
+    rebuild_file = SNAPSHOT_FILE if scheduler_running else LOCAL_SNAPSHOT_FILE
+    print(f"Catalog snapshot is stale, rebuilding {rebuild_file} from JSON.")
+    with data_file_lock:
+        try:
+            data = _read_scraped_data()
+        except (OSError, ValueError) as e:
+            data = None
+            print(f"Cannot rebuild catalog snapshot: {e}")
+        if data is not None:
+            catalog_snapshot.write_snapshot(data, rebuild_file)
+    if data is not None:
+        return catalog_snapshot.open_snapshot(rebuild_file)
+
+    previous = sorted((path for path in (SNAPSHOT_FILE, LOCAL_SNAPSHOT_FILE) if os.path.exists(path)),
+                      key=os.path.getmtime, reverse=True)
+    for path in previous:
+        try:
+            return catalog_snapshot.open_snapshot(path)
+        except (OSError, catalog_snapshot.SnapshotError):
+            continue
+    raise catalog_snapshot.SnapshotError(f"No catalog snapshot and {SCRAPED_DATA_FILE} cannot be parsed")
+
+def get_manga_entry(manga_id):
+    """Looks up a single manga without loading the whole catalog."""
+    snapshot = get_catalog_snapshot()
+    return snapshot.get(manga_id) if snapshot else None
 
 def _merge_manga_data(existing_data_map, new_data_list):
     merged_map = existing_data_map.copy()
@@ -85,7 +171,7 @@ def get_enabled_scrapers():
                 
     ai_config = config.get('ai_scraper', {})
     if ai_config.get('enabled'):
-        scrapers.append(AIScraper(base_url="AI_Generated"))
+        scrapers.append(AIScraper(base_url="AI_Generated", template_dir=ai_config.get('template_dir')))
         
     return scrapers
 
@@ -97,6 +183,83 @@ def get_scraper_for_manga(manga_url):
         return scrapers[0]
     return None
 
+def _chapter_sort_key(chapter):
+    match = re.search(r'\d+(\.\d+)?', chapter.get('title', '0'))
+    return float(match.group(0)) if match else 0
+
+def manga_id_from_url(manga_url):
+    clean_url = manga_url.rstrip('/')
+    return clean_url.split('/')[-1] if clean_url else f"manga_{hash(manga_url)}"
+
+def apply_manga_detail(manga_entry, manga_id, manga_url, detail_data, grab_all_chapters=False, keep_images=False):
+    """
+    Merges freshly scraped detail data into manga_entry (in place) and returns a map of
+    chapter id -> chapter combining stored chapters with the ones listed on the live site.
+    With grab_all_chapters, stored images are cleared for re-scraping unless keep_images is
+    set (the entry is saved before the new images arrive).
+    """
+    manga_entry['id'] = manga_id
+    manga_entry['url'] = manga_url
+    manga_entry['title'] = detail_data.get('title', manga_entry.get('title', 'N/A'))
+    manga_entry['cover'] = detail_data.get('cover', manga_entry.get('cover', 'N/A'))
+
+    if manga_url in load_favorites_urls():
+        manga_entry['genre_type'] = 'Favorite'
+    else:
+        manga_entry['genre_type'] = manga_entry.get('genre_type', 'N/A')
+
+    manga_entry['description'] = detail_data.get('description', manga_entry.get('description', 'N/A'))
+    manga_entry['alt_titles'] = detail_data.get('alt_titles', manga_entry.get('alt_titles', []))
+    manga_entry['status'] = detail_data.get('status', manga_entry.get('status', 'N/A'))
+    manga_entry['author'] = detail_data.get('author', manga_entry.get('author', 'N/A'))
+    manga_entry['artist'] = detail_data.get('artist', manga_entry.get('artist', 'N/A'))
+    manga_entry['genres'] = detail_data.get('genres', manga_entry.get('genres', []))
+
+    chapters_from_live_site = detail_data.get('chapters', [])
+    sorted_live_chapters = sorted(chapters_from_live_site, key=_chapter_sort_key)
+
+    all_chapters_map = {}
+    for chap in manga_entry.get('chapters', []):
+        all_chapters_map[chap['id']] = chap.copy()
+
+    for live_chap in sorted_live_chapters:
+        chap_id = live_chap['id']
+        if chap_id in all_chapters_map:
+            current_chapter_data = all_chapters_map[chap_id]
+            current_chapter_data.update({
+                k: v for k, v in live_chap.items() if k != 'images'
+            })
+            if not current_chapter_data.get('images') or (grab_all_chapters and not keep_images):
+                current_chapter_data['images'] = []
+        else:
+            all_chapters_map[chap_id] = live_chap.copy()
+
+    return all_chapters_map
+
+def select_chapters_for_images(all_chapters_map, max_chapters_per_manga=1, grab_all_chapters=False):
+    """Returns the chapters whose page images should be scraped."""
+    if grab_all_chapters:
+        return list(all_chapters_map.values())
+
+    sorted_unique_chapters = sorted(all_chapters_map.values(), key=_chapter_sort_key)
+    return [chapter for chapter in sorted_unique_chapters[:max_chapters_per_manga] if not chapter.get('images')]
+
+def finalize_manga_entry(manga_entry, all_chapters_map):
+    """Stores the sorted chapter list on manga_entry and updates its latest chapter fields."""
+    manga_entry['chapters'] = sorted(all_chapters_map.values(), key=_chapter_sort_key)
+
+    if manga_entry['chapters']:
+        manga_entry['latest_chapter_title'] = manga_entry['chapters'][-1].get('title', 'N/A')
+        manga_entry['latest_chapter_url'] = manga_entry['chapters'][-1].get('url', 'N/A')
+    else:
+        manga_entry['latest_chapter_title'] = 'N/A'
+        manga_entry['latest_chapter_url'] = 'N/A'
+
+def queue_manga_thumbnails(thumbnail_jobs, manga_entry, thumbnail_settings):
+    # Thumbnails are generated on the worker pool while scraping continues.
+    # Unchanged cover URLs are resolved from the thumbnail index without refetching.
+    thumbnail_jobs.append((manga_entry, 'cover_thumb', thumbnails.submit_thumbnail(manga_entry['cover'], thumbnail_settings)))
+
 def scrape_manga_urls(scrapers, manga_urls_to_scrape, existing_mangas_map, max_chapters_per_manga=1, grab_all_chapters=False):
     current_scrape_results_map = {} 
     
@@ -105,10 +268,11 @@ def scrape_manga_urls(scrapers, manga_urls_to_scrape, existing_mangas_map, max_c
         return []
 
     primary_scraper = scrapers[0] 
+    thumbnail_settings = thumbnails.get_thumbnail_settings()
+    thumbnail_jobs = []
 
     for manga_url in manga_urls_to_scrape:
-        clean_url = manga_url.rstrip('/')
-        manga_id = clean_url.split('/')[-1] if clean_url else f"manga_{hash(manga_url)}"
+        manga_id = manga_id_from_url(manga_url)
 
         print(f"\nScraping details for: {manga_url}")
         time.sleep(1)
@@ -123,58 +287,9 @@ def scrape_manga_urls(scrapers, manga_urls_to_scrape, existing_mangas_map, max_c
         detail_data = scraper.scrape_manga_detail(detail_page_html)
 
         manga_entry = existing_mangas_map.get(manga_id, {})
-        manga_entry['id'] = manga_id
-        manga_entry['url'] = manga_url
-        manga_entry['title'] = detail_data.get('title', manga_entry.get('title', 'N/A'))
-        manga_entry['cover'] = detail_data.get('cover', manga_entry.get('cover', 'N/A'))
+        all_chapters_map = apply_manga_detail(manga_entry, manga_id, manga_url, detail_data, grab_all_chapters)
 
-        if manga_url in load_favorites_urls():
-            manga_entry['genre_type'] = 'Favorite'
-        else:
-            manga_entry['genre_type'] = manga_entry.get('genre_type', 'N/A')
-
-        manga_entry['description'] = detail_data.get('description', manga_entry.get('description', 'N/A'))
-        manga_entry['alt_titles'] = detail_data.get('alt_titles', manga_entry.get('alt_titles', []))
-        manga_entry['status'] = detail_data.get('status', manga_entry.get('status', 'N/A'))
-        manga_entry['author'] = detail_data.get('author', manga_entry.get('author', 'N/A'))
-        manga_entry['artist'] = detail_data.get('artist', manga_entry.get('artist', 'N/A'))
-        manga_entry['genres'] = detail_data.get('genres', manga_entry.get('genres', []))
-
-        chapters_from_live_site = detail_data.get('chapters', [])
-        sorted_live_chapters = sorted(chapters_from_live_site,
-                                      key=lambda c: float(re.search(r'\d+(\.\d+)?', c.get('title', '0')).group(0))
-                                      if re.search(r'\d+(\.\d+)?', c.get('title', '0')) else 0)
-
-        existing_chapters_for_manga = existing_mangas_map.get(manga_id, {}).get('chapters', [])
-        
-        all_chapters_map = {}
-        for chap in existing_chapters_for_manga:
-            all_chapters_map[chap['id']] = chap.copy()
-
-        for live_chap in sorted_live_chapters:
-            chap_id = live_chap['id']
-            if chap_id in all_chapters_map:
-                current_chapter_data = all_chapters_map[chap_id]
-                current_chapter_data.update({
-                    k: v for k, v in live_chap.items() if k != 'images'
-                })
-                if not current_chapter_data.get('images') or grab_all_chapters:
-                    current_chapter_data['images'] = []
-            else:
-                all_chapters_map[chap_id] = live_chap.copy()
-
-        chapters_to_scrape_images = []
-        if grab_all_chapters:
-            chapters_to_scrape_images = list(all_chapters_map.values())
-        else:
-            sorted_unique_chapters = sorted(list(all_chapters_map.values()),
-                                            key=lambda c: float(re.search(r'\d+(\.\d+)?', c.get('title', '0')).group(0))
-                                            if re.search(r'\d+(\.\d+)?', c.get('title', '0')) else 0)
-            
-            chapters_to_consider_for_image_scrape = sorted_unique_chapters[:max_chapters_per_manga]
-            for chapter in chapters_to_consider_for_image_scrape:
-                if not chapter.get('images'):
-                    chapters_to_scrape_images.append(chapter)
+        chapters_to_scrape_images = select_chapters_for_images(all_chapters_map, max_chapters_per_manga, grab_all_chapters)
 
         for chapter_to_scrape in chapters_to_scrape_images:
             print(f"  Scraping pages for chapter: {chapter_to_scrape['title']} ({chapter_to_scrape['url']})")
@@ -189,20 +304,14 @@ def scrape_manga_urls(scrapers, manga_urls_to_scrape, existing_mangas_map, max_c
             all_chapters_map[chapter_to_scrape['id']] = chapter_to_scrape
             time.sleep(1) 
 
-        manga_entry['chapters'] = sorted(list(all_chapters_map.values()),
-                                         key=lambda c: float(re.search(r'\d+(\.\d+)?', c.get('title', '0')).group(0))
-                                         if re.search(r'\d+(\.\d+)?', c.get('title', '0')) else 0)
-
-        if manga_entry['chapters']:
-            manga_entry['latest_chapter_title'] = manga_entry['chapters'][-1].get('title', 'N/A')
-            manga_entry['latest_chapter_url'] = manga_entry['chapters'][-1].get('url', 'N/A')
-        else:
-            manga_entry['latest_chapter_title'] = 'N/A'
-            manga_entry['latest_chapter_url'] = 'N/A'
+        finalize_manga_entry(manga_entry, all_chapters_map)
+        queue_manga_thumbnails(thumbnail_jobs, manga_entry, thumbnail_settings)
 
         current_scrape_results_map[manga_entry['id']] = manga_entry
         time.sleep(2) 
 
+    thumbnails.apply_thumbnail_jobs(thumbnail_jobs)
+
     return list(current_scrape_results_map.values())
 
 def scrape_specific_chapter(manga_id, chapter_id):
@@ -242,8 +351,7 @@ def scrape_specific_chapter(manga_id, chapter_id):
 
 def scrape_manga_full(manga_id):
     """Scrapes all chapters of a specific manga."""
-    all_data = load_scraped_data()
-    manga_entry = next((m for m in all_data if m['id'] == manga_id), None)
+    manga_entry = get_manga_entry(manga_id)
     
     if not manga_entry:
         return False
@@ -296,31 +404,33 @@ def scrape_recommendations_data(scrapers, num_recommendations_per_genre=5, max_c
         return []
         
     primary_scraper = scrapers[0]
-    
-    all_genre_manga_summaries = []
+    pool_settings = recommendation_pool.get_pool_settings()
+    pool = recommendation_pool.load_pool()
+
+    # Crawl a few more listing pages per genre each cycle instead of re-reading page 1.
     for genre_url in GENRE_URLS:
         genre_type = genre_url.split('/')[-2]
-        list_page_html = primary_scraper.fetch_html(genre_url)
-        if list_page_html:
-            all_genre_manga_summaries.extend(primary_scraper.scrape_manga_list(list_page_html, genre_type))
+        for page in recommendation_pool.pages_to_crawl(pool, genre_url, pool_settings):
+            try:
+                list_page_html = primary_scraper.fetch_html(recommendation_pool.genre_page_url(genre_url, page), raise_not_found=True)
+                summaries = primary_scraper.scrape_manga_list(list_page_html, genre_type) if list_page_html else None
+            except PageNotFound:
+                summaries = [] # Past the last page of the listing
+            recommendation_pool.record_list_page(pool, genre_url, page, summaries, pool_settings)
+    recommendation_pool.prune_pool(pool, pool_settings)
 
-    favorites_urls = load_favorites_urls()
-    non_favorite_manga_summaries = [
-        m for m in all_genre_manga_summaries if m['url'] not in favorites_urls
-    ]
+    existing_data = load_scraped_data()
+    existing_mangas_map = {manga['id']: manga for manga in existing_data}
 
     num_recommendations_total = num_recommendations_per_genre * len(GENRE_URLS)
-    if len(non_favorite_manga_summaries) > num_recommendations_total:
-        recommendation_summaries = random.sample(non_favorite_manga_summaries, num_recommendations_total)
-    else:
-        recommendation_summaries = non_favorite_manga_summaries 
+    recommendation_summaries = recommendation_pool.pick_candidates(
+        pool, existing_mangas_map, load_favorites_urls(), num_recommendations_total
+    )
+    print(f"Recommendations: {len(recommendation_summaries)} of {len(pool['candidates'])} pool candidates have new data.")
 
     manga_urls_to_scrape = [m['url'] for m in recommendation_summaries]
 
-    existing_data = load_scraped_data()
-    existing_mangas_map = {manga['id']: manga for manga in existing_data}
-
-    return scrape_manga_urls(
+    recommendations_data = scrape_manga_urls(
         scrapers,
         manga_urls_to_scrape=manga_urls_to_scrape,
         existing_mangas_map=existing_mangas_map,
@@ -328,15 +438,307 @@ def scrape_recommendations_data(scrapers, num_recommendations_per_genre=5, max_c
         grab_all_chapters=grab_all_chapters 
     )
 
-def run_scraper_loop():
+    recommendation_pool.mark_scraped(pool, [m['url'] for m in recommendations_data])
+    recommendation_pool.save_pool(pool)
+    return recommendations_data
+
+# --- Distributed Mode ---
+# The coordinator (the scheduler loop) enqueues scrape units into the shared work table and
+# is the only writer of the catalog JSON: workers store parsed results on their units and the
+# coordinator merges them, enqueueing follow-up units (list page -> manga detail -> chapter pages).
+
+def enqueue_favorite_units(table, max_chapters_per_manga=1, grab_all_chapters=False):
+    for manga_url in load_favorites_urls():
+        table.enqueue(work_queue.MANGA_DETAIL, manga_url, {
+            'url': manga_url,
+            'max_chapters_per_manga': max_chapters_per_manga,
+            'grab_all_chapters': grab_all_chapters
+        }, priority=2)
+
+def enqueue_manga_unit(table, manga_url, max_chapters_per_manga=9999, grab_all_chapters=True):
+    """
+    Queues a user-requested (re)scrape of one manga ahead of scheduled work, taking over a
+    scheduled unit for the same manga that has not started yet. Returns False if a scrape
+    of it is already running.
+    """
+    return table.enqueue(work_queue.MANGA_DETAIL, manga_url, {
+        'url': manga_url,
+        'max_chapters_per_manga': max_chapters_per_manga,
+        'grab_all_chapters': grab_all_chapters
+    }, priority=3, replace_pending=True)
+
+def enqueue_chapter_unit(table, manga_id, chapter):
+    return table.enqueue(work_queue.CHAPTER_PAGES, f"{manga_id}/{chapter['id']}", {
+        'url': chapter['url'],
+        'manga_id': manga_id,
+        'chapter_id': chapter['id']
+    }, priority=3)
+
+def enqueue_recommendation_units(table, num_recommendations_per_genre=5, max_chapters_per_manga=5):
+    pool_settings = recommendation_pool.get_pool_settings()
+    pool = recommendation_pool.load_pool()
+    for genre_url in GENRE_URLS:
+        pages = recommendation_pool.pages_to_crawl(pool, genre_url, pool_settings)
+        for page in pages:
+            page_url = recommendation_pool.genre_page_url(genre_url, page)
+            table.enqueue(work_queue.LIST_PAGE, page_url, {
+                'url': page_url,
+                'genre_url': genre_url,
+                'page': page,
+                'genre_type': genre_url.split('/')[-2],
+                'num_recommendations': num_recommendations_per_genre,
+                'max_chapters_per_manga': max_chapters_per_manga,
+                # Recommendations are picked once the genre's last page of this cycle is merged.
+                'pick': page == pages[-1]
+            }, priority=1)
+
+def process_unit(scraper, unit):
+    """Fetches and parses one work unit. Returns the JSON-serialisable result stored on the unit."""
+    payload = unit['payload']
+    try:
+        html = scraper.fetch_html(payload['url'], raise_not_found=True)
+    except PageNotFound:
+        if unit['kind'] == work_queue.LIST_PAGE:
+            return {'summaries': []} # Past the last page: the merge wraps the genre back to page 1
+        raise
+    if not html:
+        if unit['kind'] == work_queue.LIST_PAGE:
+            # Listing pages are crawled again next cycle, so the failure goes to the pool
+            # (and the genre still gets its picks) instead of being retried.
+            return {'summaries': None}
+        raise RuntimeError(f"Could not fetch {payload['url']}")
+
+    if unit['kind'] == work_queue.LIST_PAGE:
+        return {'summaries': scraper.scrape_manga_list(html, payload['genre_type'])}
+    if unit['kind'] == work_queue.MANGA_DETAIL:
+        return {'detail': scraper.scrape_manga_detail(html)}
+    if unit['kind'] == work_queue.CHAPTER_PAGES:
+        return {'images': scraper.scrape_chapter_pages(html).get('images', [])}
+    raise ValueError(f"Unknown work unit kind '{unit['kind']}'")
+
+def _keep_lease_alive(table, unit_id, worker_id, interval, done_event):
+    while not done_event.wait(interval):
+        if not table.heartbeat(unit_id, worker_id):
+            print(f"Worker {worker_id} lost lease on unit {unit_id}.")
+            return
+
+def run_worker(table, worker_id, stop_event=None, idle_seconds=5):
+    """Leases and processes units until stop_event is set."""
+    settings = work_queue.get_distributed_settings(load_config())
+    stop_event = stop_event or threading.Event()
+    print(f"Worker {worker_id} started.")
+
+    while not stop_event.is_set():
+        scrapers = get_enabled_scrapers()
+        unit = table.lease(worker_id) if scrapers else None
+        if unit is None:
+            stop_event.wait(idle_seconds)
+            continue
+
+        print(f"Worker {worker_id}: {unit['kind']} {unit['unit_key']} (attempt {unit['attempts']})")
+        done_event = threading.Event()
+        heartbeat = threading.Thread(
+            target=_keep_lease_alive,
+            args=(table, unit['id'], worker_id, settings['heartbeat_seconds'], done_event),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = process_unit(scrapers[0], unit)
+            if not table.complete(unit['id'], worker_id, result):
+                print(f"Worker {worker_id}: lease on unit {unit['id']} expired, result discarded.")
+        except Exception as e:
+            print(f"Worker {worker_id}: unit {unit['id']} failed: {e}")
+            table.fail(unit['id'], worker_id, e)
+        finally:
+            done_event.set()
+            heartbeat.join()
+        time.sleep(1)
+
+def start_local_workers(table, count):
+    for i in range(count):
+        t = threading.Thread(target=run_worker, args=(table, f"local-{os.getpid()}-{i}"))
+        t.daemon = True
+        t.start()
+
+def merge_completed_units(table):
+    """Merges finished unit results into the catalog and enqueues follow-up units."""
+    units = table.claim_results()
+    if not units:
+        return 0
+
+    existing_mangas_map = {manga['id']: manga for manga in load_scraped_data()}
+    thumbnail_settings = thumbnails.get_thumbnail_settings()
+    thumbnail_jobs = []
+    pool_settings = recommendation_pool.get_pool_settings()
+    pool = recommendation_pool.load_pool()
+
+    for unit in units:
+        payload = unit['payload']
+        result = unit['result'] or {}
+
+        if unit['kind'] == work_queue.LIST_PAGE:
+            recommendation_pool.record_list_page(pool, payload['genre_url'], payload['page'], result.get('summaries', []), pool_settings)
+            if not payload['pick']:
+                continue
+            recommendation_pool.prune_pool(pool, pool_settings)
+            candidates = recommendation_pool.pick_candidates(
+                pool, existing_mangas_map, load_favorites_urls(), payload['num_recommendations'], genre_type=payload['genre_type']
+            )
+            for summary in candidates:
+                table.enqueue(work_queue.MANGA_DETAIL, summary['url'], {
+                    'url': summary['url'],
+                    'max_chapters_per_manga': payload['max_chapters_per_manga'],
+                    'grab_all_chapters': False
+                }, priority=1)
+
+        elif unit['kind'] == work_queue.MANGA_DETAIL:
+            manga_url = payload['url']
+            manga_id = manga_id_from_url(manga_url)
+            manga_entry = existing_mangas_map.get(manga_id, {})
+            # The catalog is saved before the CHAPTER_PAGES units run, so stored images stay
+            # visible until those units replace them.
+            all_chapters_map = apply_manga_detail(manga_entry, manga_id, manga_url, result.get('detail', {}),
+                                                  payload['grab_all_chapters'], keep_images=True)
+
+            for chapter in select_chapters_for_images(all_chapters_map, payload['max_chapters_per_manga'], payload['grab_all_chapters']):
+                enqueue_chapter_unit(table, manga_id, chapter)
+
+            finalize_manga_entry(manga_entry, all_chapters_map)
+            queue_manga_thumbnails(thumbnail_jobs, manga_entry, thumbnail_settings)
+            existing_mangas_map[manga_id] = manga_entry
+            recommendation_pool.mark_scraped(pool, [manga_url])
+
+        elif unit['kind'] == work_queue.CHAPTER_PAGES:
+            manga_entry = existing_mangas_map.get(payload['manga_id'])
+            if not manga_entry:
+                continue
+            for chapter in manga_entry.get('chapters', []):
+                if chapter['id'] == payload['chapter_id']:
+                    images = result.get('images', [])
+                    if images or not chapter.get('images'):
+                        chapter['images'] = images
+                    break
+
+    thumbnails.apply_thumbnail_jobs(thumbnail_jobs)
+    save_scraped_data(list(existing_mangas_map.values()))
+    recommendation_pool.save_pool(pool)
+    print(f"Merged {len(units)} completed work units.")
+    return len(units)
+
+def get_work_table():
+    """
+    Returns the shared work table in distributed mode, opening it on first use (API nodes
+    only enqueue into it), or None when scrapes are not distributed. An in-process 'local'
+    table is only useful where the scheduler loop runs.
+    """
+    global work_table
+    with work_table_lock:
+        if work_table is None:
+            settings = work_queue.get_distributed_settings(load_config())
+            if settings['enabled'] and (settings['backend'] != 'local' or scheduler_running):
+                work_table = work_queue.create_work_table(settings)
+        return work_table
+
+def run_distributed_cycle(table):
+    """Enqueues one cycle's worth of units and returns the number of seconds until the next one."""
+    global last_scrape_time, next_scrape_time, scraper_status_message
+
+    scraping_config = load_config().get('scraping', {})
+    interval_seconds = scraping_config.get('interval_hours', 8) * 3600
+    num_recs = scraping_config.get('num_recommendations_per_genre', 5)
+    max_chapters = scraping_config.get('max_chapters_per_manga', 1)
+    grab_all_favs = scraping_config.get('grab_all_chapters_favorites', False)
+
+    enqueue_favorite_units(table, max_chapters_per_manga=max_chapters, grab_all_chapters=grab_all_favs)
+    if favorite_scrape_event.is_set():
+        favorite_scrape_event.clear()
+        scraper_status_message = "Favorites queued for workers."
+    else:
+        enqueue_recommendation_units(table, num_recommendations_per_genre=num_recs, max_chapters_per_manga=max_chapters)
+        last_scrape_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        scraper_status_message = "Cycle queued for workers."
+
+    next_scrape_time = (datetime.datetime.now() + datetime.timedelta(seconds=interval_seconds)).strftime("%Y-%m-%d %H:%M:%S")
+    return interval_seconds
+
+def run_scrape_cycle(scrapers):
+    """Runs one scheduler cycle and returns the number of seconds until the next one."""
     global last_scrape_time, next_scrape_time, is_scraper_running, scraper_status_message
 
+    config = load_config()
+    scraping_config = config.get('scraping', {})
+    interval_hours = scraping_config.get('interval_hours', 8)
+    interval_seconds = interval_hours * 3600
+    
+    num_recs = scraping_config.get('num_recommendations_per_genre', 5)
+    max_chapters = scraping_config.get('max_chapters_per_manga', 1)
+    grab_all_favs = scraping_config.get('grab_all_chapters_favorites', False)
+
+    if favorite_scrape_event.is_set():
+        scraper_status_message = "Immediate favorites scrape triggered..."
+        favorite_scrape_event.clear()
+        
+        existing_full_data = load_scraped_data()
+        existing_full_map = {manga['id']: manga for manga in existing_full_data}
+
+        favorites_data = scrape_favorites_data(scrapers, max_chapters_per_manga=max_chapters, grab_all_chapters=grab_all_favs)
+        
+        merged_data = _merge_manga_data(existing_full_map, favorites_data)
+        save_scraped_data(merged_data)
+        
+        scraper_status_message = "Immediate favorites scrape finished."
+        next_scrape_time = (datetime.datetime.now() + datetime.timedelta(seconds=interval_seconds)).strftime("%Y-%m-%d %H:%M:%S")
+
+    else:
+        is_scraper_running = True
+        scraper_status_message = f"Scraping... Last run: {last_scrape_time}"
+        last_scrape_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Phase 1: Favorites
+        favorites_data = scrape_favorites_data(scrapers, max_chapters_per_manga=max_chapters, grab_all_chapters=grab_all_favs)
+        
+        existing_full_data = load_scraped_data()
+        existing_full_map = {manga['id']: manga for manga in existing_full_data}
+
+        merged_data_after_favorites = _merge_manga_data(existing_full_map, favorites_data)
+        save_scraped_data(merged_data_after_favorites)
+
+        # Phase 2: Recommendations
+        existing_full_map_after_favs = {manga['id']: manga for manga in merged_data_after_favorites}
+        recommendations_data = scrape_recommendations_data(scrapers, num_recommendations_per_genre=num_recs, max_chapters_per_manga=max_chapters, grab_all_chapters=False)
+        
+        final_scraped_data = _merge_manga_data(existing_full_map_after_favs, recommendations_data)
+        save_scraped_data(final_scraped_data)
+
+        is_scraper_running = False
+        scraper_status_message = "Scrape finished."
+        next_scrape_time = (datetime.datetime.now() + datetime.timedelta(seconds=interval_seconds)).strftime("%Y-%m-%d %H:%M:%S")
+
+    return interval_seconds
+
+def run_cycle(scrapers, table):
+    """One scheduler cycle: in distributed mode, merge what workers finished and queue the next units."""
+    if table is not None:
+        merge_completed_units(table)
+        return run_distributed_cycle(table)
+    return run_scrape_cycle(scrapers)
+
+def run_scraper_loop():
+    global scheduler_running
+    scheduler_running = True
+
     # Ensure public dir exists
     os.makedirs(FRONTEND_PUBLIC_DIR, exist_ok=True)
     if not os.path.exists(FAVORITES_FILE):
         with open(FAVORITES_FILE, 'w') as f:
             json.dump([], f)
 
+    distributed_settings = work_queue.get_distributed_settings(load_config())
+    table = get_work_table()
+    if table is not None:
+        start_local_workers(table, distributed_settings['local_workers'])
+
     while True:
         scrapers = get_enabled_scrapers()
         if not scrapers:
@@ -344,60 +746,27 @@ def run_scraper_loop():
             time.sleep(60)
             continue
             
-        config = load_config()
-        scraping_config = config.get('scraping', {})
-        interval_hours = scraping_config.get('interval_hours', 8)
-        interval_seconds = interval_hours * 3600
-        
-        num_recs = scraping_config.get('num_recommendations_per_genre', 5)
-        max_chapters = scraping_config.get('max_chapters_per_manga', 1)
-        grab_all_favs = scraping_config.get('grab_all_chapters_favorites', False)
-
-        if favorite_scrape_event.is_set():
-            scraper_status_message = "Immediate favorites scrape triggered..."
-            favorite_scrape_event.clear()
-            
-            existing_full_data = load_scraped_data()
-            existing_full_map = {manga['id']: manga for manga in existing_full_data}
-
-            favorites_data = scrape_favorites_data(scrapers, max_chapters_per_manga=max_chapters, grab_all_chapters=grab_all_favs)
-            
-            merged_data = _merge_manga_data(existing_full_map, favorites_data)
-            save_scraped_data(merged_data)
-            
-            scraper_status_message = "Immediate favorites scrape finished."
-            next_scrape_time = (datetime.datetime.now() + datetime.timedelta(seconds=interval_seconds)).strftime("%Y-%m-%d %H:%M:%S")
-
-        else:
-            is_scraper_running = True
-            scraper_status_message = f"Scraping... Last run: {last_scrape_time}"
-            last_scrape_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Phase 1: Favorites
-            favorites_data = scrape_favorites_data(scrapers, max_chapters_per_manga=max_chapters, grab_all_chapters=grab_all_favs)
-            
-            existing_full_data = load_scraped_data()
-            existing_full_map = {manga['id']: manga for manga in existing_full_data}
-
-            merged_data_after_favorites = _merge_manga_data(existing_full_map, favorites_data)
-            save_scraped_data(merged_data_after_favorites)
-
-            # Phase 2: Recommendations
-            existing_full_map_after_favs = {manga['id']: manga for manga in merged_data_after_favorites}
-            recommendations_data = scrape_recommendations_data(scrapers, num_recommendations_per_genre=num_recs, max_chapters_per_manga=max_chapters, grab_all_chapters=False)
-            
-            final_scraped_data = _merge_manga_data(existing_full_map_after_favs, recommendations_data)
-            save_scraped_data(final_scraped_data)
-
-            is_scraper_running = False
-            scraper_status_message = "Scrape finished."
-            next_scrape_time = (datetime.datetime.now() + datetime.timedelta(seconds=interval_seconds)).strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Wait with check
+        try:
+            if profiling.cycle_profile_event.is_set():
+                profiling.cycle_profile_event.clear()
+                interval_seconds = profiling.run_profiled('cycle', run_cycle, scrapers, table)
+            else:
+                interval_seconds = run_cycle(scrapers, table)
+        except Exception:
+            # Keep the scheduler thread alive; a bad config value or scraper bug retries later.
+            print("Scrape cycle failed, retrying in 60 seconds:")
+            traceback.print_exc()
+            interval_seconds = 60
+
+        # Wait with check, merging worker results as they come in
         end_time = time.time() + interval_seconds
+        next_merge_time = time.time()
         while time.time() < end_time:
-            if favorite_scrape_event.is_set():
+            if favorite_scrape_event.is_set() or profiling.cycle_profile_event.is_set():
                 break
+            if table is not None and time.time() >= next_merge_time:
+                merge_completed_units(table)
+                next_merge_time = time.time() + distributed_settings['merge_interval_seconds']
             time.sleep(1)
 
 def start_scheduler():
@@ -1,38 +1,222 @@
 from .base import ScraperBase
+from . import template_inference
+from .template_inference import LIST_PAGE, DETAIL_PAGE, CHAPTER_PAGE
 import requests
 from bs4 import BeautifulSoup
+import json
+import os
 import re
+import threading
+from urllib.parse import urlparse
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'ai_templates')
+
+class TemplateStore:
+    """Learned extraction templates, one JSON file per domain."""
+    def __init__(self, template_dir=None):
+        self.template_dir = template_dir or DEFAULT_TEMPLATE_DIR
+        self._cache = {}
+
+    def _path(self, domain):
+        safe_domain = re.sub(r'[^A-Za-z0-9.-]', '_', domain) or 'default'
+        return os.path.join(self.template_dir, f"{safe_domain}.json")
+
+    def _load(self, domain):
+        if domain not in self._cache:
+            self._cache[domain] = {}
+            path = self._path(domain)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self._cache[domain] = json.load(f).get('templates', {})
+                except json.JSONDecodeError:
+                    pass
+        return self._cache[domain]
+
+    def get(self, domain, page_type):
+        return self._load(domain).get(page_type)
+
+    def put(self, domain, page_type, template):
+        templates = self._load(domain)
+        templates[page_type] = template
+        os.makedirs(self.template_dir, exist_ok=True)
+        # config/ is shared by every worker, so each writer needs its own temporary file.
+        tmp_path = f"{self._path(domain)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'domain': domain, 'templates': templates}, f, indent=4)
+        os.replace(tmp_path, self._path(domain))
 
 class AIScraper(ScraperBase):
     """
     Experimental AI Scraper.
-    Currently uses simple heuristics but designed to be extensible with LLMs.
+    Learns CSS selector templates per domain from sample pages, caches them on disk and
+    extracts later pages with the cached selectors. A template is re-learned only when
+    its extraction fails validation. The inference step is pluggable: inferrer(page_type,
+    html_samples) must return {field: {'selector': ..., optional 'attr': ...}}; the default
+    uses simple heuristics but can be swapped for an LLM-backed one.
     """
-    def __init__(self, base_url):
+    MAX_SAMPLES = 3
+
+    def __init__(self, base_url=None, template_dir=None, inferrer=None):
         self.base_url = base_url
+        self.templates = TemplateStore(template_dir)
+        self.inferrer = inferrer or template_inference.infer_template
+        self.current_url = base_url if base_url and base_url.startswith('http') else None
+        self._samples = {}
+        self._detail_titles = {} # domain -> (url, title) of the last valid detail page
+
+    def fetch_html(self, url, retries=3, delay=2, raise_not_found=False):
+        # Remember the page URL: it selects the domain template and resolves relative links.
+        self.current_url = url
+        return super().fetch_html(url, retries, delay, raise_not_found)
+
+    @property
+    def domain(self):
+        return urlparse(self.current_url).netloc if self.current_url else 'default'
+
+    def _absolute(self, url):
+        if not url:
+            return 'N/A'
+        url = url.strip()
+        if url.startswith('//'):
+            return 'https:' + url
+        if self.current_url and not url.startswith('http'):
+            return requests.compat.urljoin(self.current_url, url)
+        return url
+
+    # --- Template handling ---
+
+    def _extract(self, page_type, html_content, extract, validate):
+        """Extracts with the cached template, learning or re-learning it when validation fails."""
+        domain = self.domain
+        # Samples are kept per URL so that re-scraping one page does not crowd out the others.
+        samples = self._samples.setdefault((domain, page_type), {})
+        samples.pop(self.current_url, None)
+        samples[self.current_url] = html_content
+        while len(samples) > self.MAX_SAMPLES:
+            del samples[next(iter(samples))]
+
+        soup = BeautifulSoup(html_content, 'html.parser')
+        template = self.templates.get(domain, page_type)
+        if template:
+            result = extract(soup, template)
+            if validate(result):
+                return result
+            print(f"AI Scraper (Experimental): Cached {page_type} template for {domain} failed validation, re-learning.")
+
+        # Only the current page is needed to re-learn a broken template; older samples
+        # may come from the layout that just changed.
+        learned = self.inferrer(page_type, list(samples.values()) if not template else [html_content])
+        result = extract(soup, learned)
+        if validate(result):
+            self.templates.put(domain, page_type, learned)
+            print(f"AI Scraper (Experimental): Learned {page_type} template for {domain}.")
+        return result
+
+    @staticmethod
+    def _select(root, rule):
+        if not rule:
+            return None
+        return root.select_one(rule['selector']) if rule['selector'] else root
+
+    def _value(self, root, rule):
+        element = self._select(root, rule)
+        if element is None:
+            return None
+        if rule.get('attr'):
+            return element.get(rule['attr'])
+        if element.name == 'img':
+            return element.get('data-src') or element.get('src')
+        return element.get_text(strip=True)
+
+    # --- Extraction ---
+
+    def _extract_list(self, soup, template, genre_type):
+        mangas = []
+        if 'item' not in template:
+            return mangas
+        for element in soup.select(template['item']['selector']):
+            link = self._select(element, template.get('title_link'))
+            if link is None or not link.get('href'):
+                continue
+            manga_full_url = self._absolute(link['href'])
+            manga_id = manga_full_url.rstrip('/').split('/')[-1] or f"manga_{hash(manga_full_url)}"
+            chapter_link = self._select(element, template.get('latest_chapter'))
+            mangas.append({
+                'id': manga_id,
+                'title': link.get_text(strip=True) or 'N/A',
+                'genre_type': genre_type,
+                'cover': self._absolute(self._value(element, template.get('cover'))),
+                'url': manga_full_url,
+                'latest_chapter_title': chapter_link.get_text(strip=True) if chapter_link else 'N/A',
+                'latest_chapter_url': self._absolute(chapter_link.get('href')) if chapter_link else 'N/A',
+                'chapters': []
+            })
+        return mangas
+
+    def _extract_detail(self, soup, template):
+        manga_details = {
+            'title': self._value(soup, template.get('title')) or 'N/A',
+            'cover': self._absolute(self._value(soup, template.get('cover'))),
+            'description': self._value(soup, template.get('description')) or 'N/A'
+        }
+        chapters = []
+        if 'chapter_item' in template:
+            for element in soup.select(template['chapter_item']['selector']):
+                link = self._select(element, template.get('chapter_link'))
+                if link is None or not link.get('href'):
+                    continue
+                chapter_full_url = self._absolute(link['href'])
+                chapter_id_match = re.search(r'chapter-(\d+(?:-\d+)?)/?$', chapter_full_url)
+                chapters.append({
+                    'id': chapter_id_match.group(1) if chapter_id_match else hash(chapter_full_url),
+                    'title': link.get_text(strip=True),
+                    'url': chapter_full_url,
+                    'date': self._value(element, template.get('chapter_date')) or 'N/A',
+                    'images': []
+                })
+        manga_details['chapters'] = chapters
+        return manga_details
+
+    def _extract_chapter(self, soup, template):
+        image_urls = []
+        if 'images' in template:
+            for img_tag in soup.select(template['images']['selector']):
+                img_src = img_tag.get('data-src') or img_tag.get('src')
+                if img_src and img_src.strip():
+                    image_urls.append(self._absolute(img_src.split('?')[0]))
+        return {'images': image_urls}
 
     def scrape_manga_list(self, html_content, genre_type="N/A"):
-        # Placeholder for AI-based list extraction
-        print(f"AI Scraper (Experimental): Parsing list from {self.base_url}...")
-        return []
+        if not html_content:
+            return []
+        print(f"AI Scraper (Experimental): Parsing list from {self.current_url}...")
+        return self._extract(
+            LIST_PAGE, html_content,
+            lambda soup, template: self._extract_list(soup, template, genre_type),
+            lambda mangas: bool(mangas)
+        )
 
     def scrape_manga_detail(self, html_content):
-        # Placeholder for AI-based detail extraction
+        if not html_content:
+            return {'chapters': []}
         print("AI Scraper (Experimental): Parsing details...")
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Simple heuristic: find largest text block as description, largest H1 as title
-        title = "Unknown AI Title"
-        h1 = soup.find('h1')
-        if h1:
-            title = h1.get_text(strip=True)
-            
-        return {
-            "title": title,
-            "description": "Extracted by AI Scraper (Experimental)",
-            "chapters": []
-        }
+        details = self._extract(DETAIL_PAGE, html_content, self._extract_detail, self._valid_detail)
+        if self._valid_detail(details):
+            self._detail_titles[self.domain] = (self.current_url, details['title'])
+        return details
+
+    def _valid_detail(self, details):
+        if details['title'] == 'N/A' or not details['chapters']:
+            return False
+        # The same title on two different manga pages means the selector matched site chrome.
+        previous = self._detail_titles.get(self.domain)
+        return not (previous and previous[0] != self.current_url and previous[1] == details['title'])
 
     def scrape_chapter_pages(self, html_content):
-        # Placeholder
-        return {'images': []}
+        if not html_content:
+            return {'images': []}
+        return self._extract(
+            CHAPTER_PAGE, html_content, self._extract_chapter,
+            lambda data: bool(data['images'])
+        )
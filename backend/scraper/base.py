@@ -1,6 +1,38 @@
 from abc import ABC, abstractmethod
+import time
+import requests
+
+NOT_FOUND_STATUSES = (404, 410)
+
+class PageNotFound(Exception):
+    """Raised by fetch_html(..., raise_not_found=True) when the page does not exist."""
 
 class ScraperBase(ABC):
+    def fetch_html(self, url, retries=3, delay=2, raise_not_found=False):
+        """
+        Returns the page HTML, or None if it could not be fetched. A missing page (404/410)
+        is not retried; with raise_not_found it raises PageNotFound instead of returning None.
+        """
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        for i in range(retries):
+            try:
+                response = requests.get(url, headers=headers, timeout=15)
+                if response.status_code in NOT_FOUND_STATUSES:
+                    print(f"Page not found: {url} ({response.status_code})")
+                    if raise_not_found:
+                        raise PageNotFound(url)
+                    return None
+                response.raise_for_status()
+                return response.text
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching {url}: {e}")
+                if i < retries - 1:
+                    time.sleep(delay)
+                    delay *= 2
+        return None
+
     @abstractmethod
     def scrape_manga_list(self, url, genre_type):
         """Scrape a list of mangas from a given URL."""
@@ -7,22 +7,6 @@ from .base import ScraperBase
 class MangaReadScraper(ScraperBase):
     BASE_URL = "https://www.mangaread.org/"
 
-    def fetch_html(self, url, retries=3, delay=2):
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        for i in range(retries):
-            try:
-                response = requests.get(url, headers=headers, timeout=15)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching {url}: {e}")
-                if i < retries - 1:
-                    time.sleep(delay)
-                    delay *= 2
-        return None
-
     def scrape_manga_list(self, html_content, genre_type="N/A"):
         if not html_content:
             return []
@@ -0,0 +1,229 @@
+import re
+from collections import defaultdict
+from bs4 import BeautifulSoup
+
+# Page types a template can describe
+LIST_PAGE = 'list'
+DETAIL_PAGE = 'detail'
+CHAPTER_PAGE = 'chapter'
+
+CHAPTER_HREF_PATTERN = re.compile(r'chapter[-_/]?\d', re.IGNORECASE)
+CSS_CLASS_PATTERN = re.compile(r'^[A-Za-z_][\w-]*$')
+
+def element_signature(element):
+    """tag.class1.class2 for an element, ignoring classes that are not plain CSS identifiers."""
+    classes = [c for c in element.get('class', []) if CSS_CLASS_PATTERN.match(c)]
+    return element.name + ''.join(f'.{c}' for c in classes)
+
+def element_selector(element, depth=3):
+    """CSS selector made of the element's signature and up to depth-1 ancestor signatures."""
+    parts = [element_signature(element)]
+    for parent in element.parents:
+        if len(parts) >= depth or parent.name in (None, '[document]', 'html', 'body'):
+            break
+        parts.append(element_signature(parent))
+    return ' '.join(reversed(parts))
+
+def relative_selector(element, root):
+    """Selector for element relative to one of its ancestors (root)."""
+    parts = []
+    for node in [element] + list(element.parents):
+        if node is root:
+            break
+        parts.append(element_signature(node))
+    return ' '.join(reversed(parts))
+
+def _unique(soup, selector, element):
+    return soup.select_one(selector) is element
+
+def _best_selector(soup, element):
+    """Shortest class-qualified selector that finds element first."""
+    for depth in (1, 2, 3, 4):
+        selector = element_selector(element, depth)
+        if '.' in selector and _unique(soup, selector, element):
+            return selector
+    return element_selector(element, 4)
+
+def _meta_content(soup, prop):
+    meta = soup.find('meta', property=prop)
+    return (meta.get('content') or '').strip().casefold() if meta else ''
+
+def _title_score(element, og_title, site_name):
+    """
+    Scores a heading as the manga title. Site chrome (logos, site name, header/nav) scores
+    low; headings matching og:title or sharing a container with the chapter list score high.
+    """
+    text = element.get_text(strip=True).casefold()
+    score = 0
+    if og_title and text in og_title:
+        score += 3
+    if site_name and text == site_name:
+        score -= 5
+    context = [element] + list(element.parents)[:3]
+    if any(node.name in ('header', 'nav', 'footer') for node in element.parents):
+        score -= 3
+    hints = ' '.join(element_signature(node) for node in context).lower()
+    if any(word in hints for word in ('logo', 'brand', 'site-title', 'navbar', 'menu')):
+        score -= 3
+    for ancestor in list(element.parents)[:4]:
+        if ancestor.find('a', href=CHAPTER_HREF_PATTERN):
+            score += 2
+            break
+    return score
+
+def _infer_title(soup):
+    og_title = _meta_content(soup, 'og:title')
+    site_name = _meta_content(soup, 'og:site_name')
+    headings = [h for h in soup.find_all(['h1', 'h2', 'h3']) if h.get_text(strip=True)]
+    scored = [(_title_score(h, og_title, site_name), i, h) for i, h in enumerate(headings)]
+    best = max(scored, key=lambda item: (item[0], -item[1]), default=None)
+    if best and best[0] > 0:
+        return {'selector': _best_selector(soup, best[2])}
+    if og_title:
+        return {'selector': 'meta[property="og:title"]', 'attr': 'content'}
+    if best and best[0] == 0:
+        return {'selector': _best_selector(soup, best[2])}
+    return None
+
+def _infer_cover(soup):
+    for img in soup.find_all('img'):
+        hints = ' '.join(element_signature(node) for node in [img] + list(img.parents)[:3]).lower()
+        if any(word in hints for word in ('cover', 'summary_image', 'thumb', 'poster')):
+            return {'selector': _best_selector(soup, img)}
+    if soup.find('meta', property='og:image'):
+        return {'selector': 'meta[property="og:image"]', 'attr': 'content'}
+    return None
+
+def _infer_description(soup):
+    best, best_length = None, 0
+    for element in soup.find_all(['p', 'div']):
+        if element.find(['div', 'ul', 'table', 'h1', 'h2']):
+            continue
+        length = len(element.get_text(strip=True))
+        hints = element_signature(element).lower() + ' ' + ' '.join(element_signature(p) for p in list(element.parents)[:2]).lower()
+        if any(word in hints for word in ('summary', 'description', 'synopsis')):
+            length *= 4
+        if length > best_length:
+            best, best_length = element, length
+    if best is None:
+        return None
+    return {'selector': _best_selector(soup, best)}
+
+def _repeating_group(elements):
+    """Groups elements by selector and returns the largest group (selector, elements)."""
+    groups = defaultdict(list)
+    for element in elements:
+        groups[element_selector(element)].append(element)
+    if not groups:
+        return None, []
+    return max(groups.items(), key=lambda item: len(item[1]))
+
+def _infer_chapter_list(soup):
+    links = [a for a in soup.find_all('a', href=True) if CHAPTER_HREF_PATTERN.search(a['href'])]
+    items = [a.find_parent('li') or a for a in links]
+    selector, group = _repeating_group(items)
+    if not group:
+        return {}
+    template = {'chapter_item': {'selector': selector}}
+    sample = group[0]
+    link = sample if sample.name == 'a' else sample.find('a', href=True)
+    template['chapter_link'] = {'selector': relative_selector(link, sample) if link is not sample else ''}
+    for element in sample.find_all(True):
+        if 'date' in element_signature(element).lower() and element.get_text(strip=True):
+            template['chapter_date'] = {'selector': relative_selector(element, sample)}
+            break
+    return template
+
+def infer_detail_template(soup):
+    template = {}
+    for field, infer in (('title', _infer_title), ('cover', _infer_cover), ('description', _infer_description)):
+        rule = infer(soup)
+        if rule:
+            template[field] = rule
+    template.update(_infer_chapter_list(soup))
+    return template
+
+def infer_chapter_template(soup):
+    images = [img for img in soup.find_all('img') if img.get('data-src') or img.get('src')]
+    containers = [img.parent for img in images]
+    selector, group = _repeating_group(containers)
+    if len(group) < 2:
+        return {}
+    return {'images': {'selector': f'{selector} img'}}
+
+def infer_list_template(soup):
+    items = []
+    for img in soup.find_all('img'):
+        for ancestor in img.parents:
+            if ancestor.name in ('body', '[document]'):
+                break
+            link = ancestor.find(lambda tag: tag.name == 'a' and tag.get('href') and tag.get_text(strip=True)
+                                 and not CHAPTER_HREF_PATTERN.search(tag['href']))
+            if link:
+                items.append(ancestor)
+                break
+    selector, group = _repeating_group(items)
+    if len(group) < 2:
+        return {}
+
+    sample = group[0]
+    template = {'item': {'selector': selector}}
+    title_link = sample.find(lambda tag: tag.name == 'a' and tag.get('href') and tag.get_text(strip=True)
+                             and not CHAPTER_HREF_PATTERN.search(tag['href']))
+    template['title_link'] = {'selector': relative_selector(title_link, sample)}
+    template['cover'] = {'selector': relative_selector(sample.find('img'), sample)}
+    chapter_link = sample.find('a', href=CHAPTER_HREF_PATTERN)
+    if chapter_link:
+        template['latest_chapter'] = {'selector': relative_selector(chapter_link, sample)}
+    return template
+
+INFERRERS = {
+    LIST_PAGE: infer_list_template,
+    DETAIL_PAGE: infer_detail_template,
+    CHAPTER_PAGE: infer_chapter_template
+}
+
+# Fields that differ on every page of their type. A rule that extracts the same value from
+# different sample pages has matched site chrome (a logo, the site name) instead.
+PER_PAGE_FIELDS = {
+    DETAIL_PAGE: ('title',)
+}
+
+def _rule_value(soup, rule):
+    element = soup.select_one(rule['selector'])
+    if element is None:
+        return None
+    return element.get(rule['attr']) if rule.get('attr') else element.get_text(strip=True)
+
+def _varies_across(soups, rule):
+    values = [_rule_value(soup, rule) for soup in soups]
+    return None not in values and len(set(values)) > 1
+
+def infer_template(page_type, html_samples):
+    """
+    Default heuristic inferrer. Infers a template from each sample page and keeps, per
+    field, the rule that was inferred from the most samples. With several samples, rules
+    for per-page fields must give a different value on each sample.
+    Returns a dict of field -> {'selector': ..., optional 'attr': ...}.
+    """
+    soups = [BeautifulSoup(html_content, 'html.parser') for html_content in html_samples]
+    votes = defaultdict(lambda: defaultdict(int))
+    rules = {}
+    for soup in soups:
+        for field, rule in INFERRERS[page_type](soup).items():
+            key = (rule['selector'], rule.get('attr'))
+            votes[field][key] += 1
+            rules[(field, key)] = rule
+
+    template = {}
+    for field, counts in votes.items():
+        ranked = sorted(counts, key=counts.get, reverse=True)
+        if len(soups) > 1 and field in PER_PAGE_FIELDS.get(page_type, ()):
+            ranked = [key for key in ranked if _varies_across(soups, rules[(field, key)])]
+            if not ranked:
+                og_rule = {'selector': f'meta[property="og:{field}"]', 'attr': 'content'}
+                if _varies_across(soups, og_rule):
+                    template[field] = og_rule
+                continue
+        template[field] = rules[(field, ranked[0])]
+    return template
@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper import template_inference
+from scraper.ai_scraper import AIScraper
+from scraper.template_inference import LIST_PAGE, DETAIL_PAGE, CHAPTER_PAGE
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+SOLO_LEVELING_URL = 'https://example.com/manga/solo-leveling/'
+TOWER_OF_GOD_URL = 'https://example.com/manga/tower-of-god/'
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+class AIScraperTest(unittest.TestCase):
+    """Learns templates from the Madara-style fixture pages, fully offline."""
+
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+        self.inferred = []
+
+        def counting_inferrer(page_type, html_samples):
+            self.inferred.append(page_type)
+            return template_inference.infer_template(page_type, html_samples)
+
+        self.scraper = AIScraper(template_dir=self.template_dir, inferrer=counting_inferrer)
+
+    def tearDown(self):
+        shutil.rmtree(self.template_dir)
+
+    def scrape_detail(self, url, fixture):
+        self.scraper.current_url = url
+        return self.scraper.scrape_manga_detail(load_fixture(fixture))
+
+    def stored_templates(self):
+        with open(os.path.join(self.template_dir, 'example.com.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)['templates']
+
+    def test_detail_title_skips_logo_heading(self):
+        details = self.scrape_detail(SOLO_LEVELING_URL, 'detail_solo_leveling.html')
+
+        self.assertEqual(details['title'], 'Solo Leveling')
+        self.assertEqual(details['cover'], 'https://example.com/covers/solo-leveling.jpg')
+        self.assertTrue(details['description'].startswith('Ten years ago'))
+        self.assertEqual([c['id'] for c in details['chapters']], ['3', '2', '1'])
+        self.assertEqual(details['chapters'][0]['date'], 'March 3, 2024')
+        self.assertNotIn('logo', self.stored_templates()[DETAIL_PAGE]['title']['selector'])
+
+    def test_detail_title_without_og_metadata(self):
+        details = self.scrape_detail(TOWER_OF_GOD_URL, 'detail_tower_of_god.html')
+        self.assertEqual(details['title'], 'Tower of God')
+
+    def test_cached_template_is_reused(self):
+        self.scrape_detail(SOLO_LEVELING_URL, 'detail_solo_leveling.html')
+        details = self.scrape_detail(TOWER_OF_GOD_URL, 'detail_tower_of_god.html')
+
+        self.assertEqual(self.inferred, [DETAIL_PAGE])
+        self.assertEqual(details['title'], 'Tower of God')
+        self.assertEqual(len(details['chapters']), 2)
+
+    def test_template_matching_site_chrome_is_relearned(self):
+        bad_template = template_inference.infer_template(DETAIL_PAGE, [load_fixture('detail_solo_leveling.html')])
+        bad_template['title'] = {'selector': 'h1.logo'}
+        self.scraper.templates.put('example.com', DETAIL_PAGE, bad_template)
+
+        self.scrape_detail(SOLO_LEVELING_URL, 'detail_solo_leveling.html')
+        details = self.scrape_detail(TOWER_OF_GOD_URL, 'detail_tower_of_god.html')
+
+        self.assertEqual(details['title'], 'Tower of God')
+        self.assertEqual(self.inferred, [DETAIL_PAGE])
+        self.assertNotEqual(self.stored_templates()[DETAIL_PAGE]['title']['selector'], 'h1.logo')
+
+    def test_title_rule_constant_across_samples_is_dropped(self):
+        samples = [load_fixture('detail_solo_leveling.html'), load_fixture('detail_tower_of_god.html')]
+        logo_inferrer = lambda soup: {'title': {'selector': 'h1.logo'}}
+        with mock.patch.dict(template_inference.INFERRERS, {DETAIL_PAGE: logo_inferrer}):
+            template = template_inference.infer_template(DETAIL_PAGE, samples)
+        self.assertNotIn('title', template)
+
+    def test_chapter_pages(self):
+        self.scraper.current_url = 'https://example.com/manga/solo-leveling/chapter-1/'
+        data = self.scraper.scrape_chapter_pages(load_fixture('chapter.html'))
+        self.assertEqual(data['images'], [
+            'https://example.com/pages/solo-leveling/1/01.jpg',
+            'https://example.com/pages/solo-leveling/1/02.jpg',
+            'https://example.com/pages/solo-leveling/1/03.jpg'
+        ])
+        self.assertIn(CHAPTER_PAGE, self.stored_templates())
+
+    def test_manga_list(self):
+        self.scraper.current_url = 'https://example.com/genres/manhwa/'
+        mangas = self.scraper.scrape_manga_list(load_fixture('list.html'), genre_type='manhwa')
+
+        self.assertEqual([m['title'] for m in mangas], ['Solo Leveling', 'Tower of God'])
+        self.assertEqual(mangas[0]['id'], 'solo-leveling')
+        self.assertEqual(mangas[0]['url'], SOLO_LEVELING_URL)
+        self.assertEqual(mangas[0]['latest_chapter_title'], 'Chapter 3')
+        self.assertEqual(mangas[1]['cover'], 'https://example.com/covers/tower-of-god-175x238.jpg')
+        self.assertIn(LIST_PAGE, self.stored_templates())
+
+if __name__ == '__main__':
+    unittest.main()
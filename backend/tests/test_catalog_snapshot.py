@@ -0,0 +1,156 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import catalog_snapshot
+from catalog_snapshot import CatalogSnapshot, SnapshotError, write_snapshot, HEADER
+
+def manga(manga_id, **fields):
+    entry = {
+        'id': manga_id,
+        'url': f'https://example.com/manga/{manga_id}/',
+        'title': f'Title {manga_id}',
+        'cover': 'https://example.com/cover.jpg',
+        'genre_type': 'manhwa',
+        'genres': ['Action', 'Fantasy'],
+        'chapters': [
+            {'id': '1', 'title': 'Chapter 1', 'url': 'https://example.com/c1/', 'date': 'N/A',
+             'images': ['https://example.com/1.jpg', 'https://example.com/2.jpg']},
+            {'id': '2', 'title': 'Chapter 2', 'url': 'https://example.com/c2/', 'date': 'N/A', 'images': []}
+        ]
+    }
+    entry.update(fields)
+    return entry
+
+class CatalogSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'catalog.snapshot')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def round_trip(self, mangas):
+        write_snapshot(mangas, self.path)
+        return CatalogSnapshot(self.path)
+
+    def test_round_trip(self):
+        mangas = [manga('solo-leveling'), manga('tower-of-god', status='Ongoing', alt_titles=['Sinui Tap'])]
+        snapshot = self.round_trip(mangas)
+
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(list(snapshot.ids()), ['solo-leveling', 'tower-of-god'])
+        for entry in mangas:
+            self.assertIn(entry['id'], snapshot)
+            self.assertEqual(snapshot.get(entry['id']), entry)
+        self.assertIsNone(snapshot.get('missing'))
+        self.assertNotIn('missing', snapshot)
+
+    def test_summaries_omit_chapters(self):
+        snapshot = self.round_trip([manga('a')])
+        summary = next(snapshot.summaries())
+        self.assertNotIn('chapters', summary)
+        self.assertEqual(summary['title'], 'Title a')
+
+    def test_non_string_ids(self):
+        mangas = [manga(42), manga(None, title='No id')]
+        mangas[0]['chapters'][0]['id'] = 7
+        snapshot = self.round_trip(mangas)
+
+        self.assertEqual(snapshot.get(42), mangas[0])
+        self.assertEqual(snapshot.get('42'), mangas[0])
+        self.assertEqual(snapshot.get(None), mangas[1])
+
+    def test_non_list_fields(self):
+        mangas = [
+            manga('a', genres='Action, Fantasy'),
+            manga('b', genres=['Action', 3], chapters=None),
+            manga('c', chapters='N/A', extra={'nested': [1, 2]})
+        ]
+        del mangas[0]['chapters']
+        mangas[2]['title'] = None
+        snapshot = self.round_trip(mangas)
+
+        for entry in mangas:
+            self.assertEqual(snapshot.get(entry['id']), entry)
+        self.assertNotIn('chapters', next(snapshot.summaries()))
+
+    def test_unicode(self):
+        mangas = [manga('나 혼자만 레벨업', title='나 혼자만 레벨업', description='Émoji 🚀 and 中文')]
+        snapshot = self.round_trip(mangas)
+        self.assertEqual(snapshot.get('나 혼자만 레벨업'), mangas[0])
+
+    def test_empty_catalog(self):
+        snapshot = self.round_trip([])
+        self.assertEqual(len(snapshot), 0)
+        self.assertEqual(list(snapshot.summaries()), [])
+        self.assertIsNone(snapshot.get('a'))
+
+    def test_generation_increments(self):
+        self.assertEqual(self.round_trip([manga('a')]).generation, 1)
+        self.assertEqual(self.round_trip([manga('a')]).generation, 2)
+
+    def patch_header(self, **fields):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        names = ('magic', 'version', 'flags', 'record_count', 'string_count', 'generation',
+                 'string_index_offset', 'string_data_offset', 'manga_index_offset')
+        header = dict(zip(names, HEADER.unpack_from(data, 0)))
+        header.update(fields)
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(*[header[name] for name in names]) + data[HEADER.size:])
+
+    def test_magic_mismatch(self):
+        write_snapshot([manga('a')], self.path)
+        self.patch_header(magic=b'NOTASNAP')
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(self.path)
+
+    def test_version_mismatch(self):
+        write_snapshot([manga('a')], self.path)
+        self.patch_header(version=catalog_snapshot.SNAPSHOT_VERSION + 1)
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(self.path)
+
+    def truncate(self, size):
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+
+    def test_truncated_header(self):
+        write_snapshot([manga('a')], self.path)
+        self.truncate(HEADER.size - 1)
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(self.path)
+
+    def test_empty_file(self):
+        open(self.path, 'wb').close()
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(self.path)
+
+    def test_truncated_records(self):
+        write_snapshot([manga('a'), manga('b')], self.path)
+        self.truncate(os.path.getsize(self.path) - 10)
+        snapshot = CatalogSnapshot(self.path)
+        self.assertEqual(snapshot.get('a')['id'], 'a')
+        with self.assertRaises(SnapshotError):
+            snapshot.get('b')
+
+    def test_truncated_index(self):
+        write_snapshot([manga('a'), manga('b')], self.path)
+        snapshot = CatalogSnapshot(self.path)
+        index_offset = snapshot._manga_index_offset
+        snapshot.close()
+        self.truncate(index_offset + 4)
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(self.path)
+
+    def test_missing_file(self):
+        with self.assertRaises(SnapshotError):
+            CatalogSnapshot(os.path.join(self.tmp_dir, 'missing.snapshot'))
+
+if __name__ == '__main__':
+    unittest.main()
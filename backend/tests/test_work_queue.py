@@ -0,0 +1,133 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import work_queue
+from work_queue import LIST_PAGE, MANGA_DETAIL, PENDING, LEASED, DONE, MERGED, FAILED
+
+LEASE_SECONDS = 0.2
+
+class WorkTableTests:
+    """Behaviour shared by every WorkTable backend. Subclasses provide make_table()."""
+
+    def setUp(self):
+        self.table = self.make_table(lease_seconds=LEASE_SECONDS, max_attempts=2, retry_delay_seconds=0)
+
+    def expire_lease(self):
+        time.sleep(LEASE_SECONDS * 1.5)
+
+    def test_outstanding_units_are_deduplicated(self):
+        self.assertTrue(self.table.enqueue(LIST_PAGE, 'page-1', {'page': 1}))
+        self.assertFalse(self.table.enqueue(LIST_PAGE, 'page-1', {'page': 1}))
+        self.assertTrue(self.table.enqueue(MANGA_DETAIL, 'page-1', {}))
+
+        unit = self.table.lease('w1')
+        self.assertFalse(self.table.enqueue(unit['kind'], unit['unit_key'], {}))
+        self.table.complete(unit['id'], 'w1', {})
+        self.assertFalse(self.table.enqueue(unit['kind'], unit['unit_key'], {}))
+
+        self.table.claim_results()
+        self.assertTrue(self.table.enqueue(unit['kind'], unit['unit_key'], {}))
+
+    def test_replace_pending_updates_payload_and_priority(self):
+        self.table.enqueue(MANGA_DETAIL, 'manga', {'grab_all_chapters': False}, priority=1)
+        self.assertTrue(self.table.enqueue(MANGA_DETAIL, 'manga', {'grab_all_chapters': True}, priority=3, replace_pending=True))
+        self.table.enqueue(LIST_PAGE, 'page-1', {}, priority=2)
+
+        unit = self.table.lease('w1')
+        self.assertEqual(unit['unit_key'], 'manga')
+        self.assertEqual(unit['payload'], {'grab_all_chapters': True})
+        self.assertFalse(self.table.enqueue(MANGA_DETAIL, 'manga', {}, priority=3, replace_pending=True))
+
+    def test_lease_order_and_state(self):
+        self.table.enqueue(LIST_PAGE, 'low', {}, priority=0)
+        self.table.enqueue(LIST_PAGE, 'high', {}, priority=5)
+
+        unit = self.table.lease('w1')
+        self.assertEqual(unit['unit_key'], 'high')
+        self.assertEqual(unit['state'], LEASED)
+        self.assertEqual(unit['attempts'], 1)
+        self.assertEqual(self.table.lease('w2')['unit_key'], 'low')
+        self.assertIsNone(self.table.lease('w3'))
+
+    def test_expired_lease_is_reclaimed(self):
+        self.table.enqueue(LIST_PAGE, 'page-1', {})
+        unit = self.table.lease('dead-worker')
+        self.assertIsNone(self.table.lease('w2'))
+
+        self.expire_lease()
+        reclaimed = self.table.lease('w2')
+        self.assertEqual(reclaimed['id'], unit['id'])
+        self.assertEqual(reclaimed['attempts'], 2)
+
+        # The dead worker's late result and heartbeat are rejected.
+        self.assertFalse(self.table.heartbeat(unit['id'], 'dead-worker'))
+        self.assertFalse(self.table.complete(unit['id'], 'dead-worker', {'late': True}))
+        self.assertTrue(self.table.complete(unit['id'], 'w2', {'ok': True}))
+
+    def test_heartbeat_keeps_lease(self):
+        self.table.enqueue(LIST_PAGE, 'page-1', {})
+        unit = self.table.lease('w1')
+        for _ in range(3):
+            time.sleep(LEASE_SECONDS / 2)
+            self.assertTrue(self.table.heartbeat(unit['id'], 'w1'))
+        self.assertIsNone(self.table.lease('w2'))
+
+    def test_expired_lease_fails_after_max_attempts(self):
+        self.table.enqueue(LIST_PAGE, 'page-1', {})
+        self.table.lease('w1')
+        self.expire_lease()
+        self.table.lease('w2')
+        self.expire_lease()
+
+        self.assertIsNone(self.table.lease('w3'))
+        self.assertEqual(self.table.counts(), {FAILED: 1})
+
+    def test_fail_retries_until_max_attempts(self):
+        self.table.enqueue(LIST_PAGE, 'page-1', {})
+        unit = self.table.lease('w1')
+        self.table.fail(unit['id'], 'w1', 'timeout')
+        self.assertEqual(self.table.counts(), {PENDING: 1})
+
+        unit = self.table.lease('w1')
+        self.table.fail(unit['id'], 'w1', 'timeout')
+        self.assertEqual(self.table.counts(), {FAILED: 1})
+        self.assertIsNone(self.table.lease('w1'))
+
+    def test_claim_results(self):
+        self.table.enqueue(LIST_PAGE, 'page-1', {'page': 1})
+        unit = self.table.lease('w1')
+        self.table.complete(unit['id'], 'w1', {'summaries': [{'id': 'a'}]})
+        self.assertEqual(self.table.counts(), {DONE: 1})
+
+        claimed = self.table.claim_results()
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(claimed[0]['state'], MERGED)
+        self.assertEqual(claimed[0]['payload'], {'page': 1})
+        self.assertEqual(claimed[0]['result'], {'summaries': [{'id': 'a'}]})
+        self.assertEqual(self.table.claim_results(), [])
+
+class LocalWorkTableTest(WorkTableTests, unittest.TestCase):
+    def make_table(self, **kwargs):
+        return work_queue.LocalWorkTable(**kwargs)
+
+class SQLiteWorkTableTest(WorkTableTests, unittest.TestCase):
+    def make_table(self, **kwargs):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        return work_queue.SQLiteWorkTable(os.path.join(self.tmp_dir, 'work_table.sqlite3'), **kwargs)
+
+    def test_table_is_shared_between_connections(self):
+        other = work_queue.SQLiteWorkTable(self.table.path, lease_seconds=LEASE_SECONDS)
+        self.table.enqueue(LIST_PAGE, 'page-1', {})
+        self.assertFalse(other.enqueue(LIST_PAGE, 'page-1', {}))
+        self.assertEqual(other.lease('w2')['unit_key'], 'page-1')
+        self.assertIsNone(self.table.lease('w1'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image, ImageOps
+
+try:
+    from .config_loader import load_config
+except ImportError:
+    from config_loader import load_config
+
+# Paths
+THUMBNAIL_DIR = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'public', 'thumbnails')
+THUMBNAIL_INDEX_FILE = os.path.join(THUMBNAIL_DIR, 'index.json')
+THUMBNAIL_ROUTE = '/thumbnails'
+
+# Output formats: config name -> (Pillow format, mimetype)
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg')
+}
+
+DEFAULT_THUMBNAIL_SETTINGS = {
+    "enabled": True,
+    "width": 300,
+    "height": 450,
+    "format": "webp",
+    "quality": 80,
+    "workers": 4,
+    "max_cache_mb": 256
+}
+
+FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': 'https://www.mangaread.org/'
+}
+
+# Global state
+index_lock = threading.Lock() # Lock for the source URL -> thumbnail index
+_index = None
+_evicted_names = set() # Evicted thumbnails that may still be referenced by the catalog
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_thumbnail_settings():
+    settings = dict(DEFAULT_THUMBNAIL_SETTINGS)
+    settings.update(load_config().get('thumbnails', {}))
+    if settings['format'] not in THUMBNAIL_FORMATS:
+        print(f"Warning: Unsupported thumbnail format '{settings['format']}', using webp.")
+        settings['format'] = 'webp'
+    return settings
+
+def thumbnail_url(name):
+    return f"{THUMBNAIL_ROUTE}/{name}"
+
+def thumbnail_path(name):
+    """Resolves a thumbnail file name, rejecting anything outside THUMBNAIL_DIR."""
+    if not name or name != os.path.basename(name) or name == os.path.basename(THUMBNAIL_INDEX_FILE):
+        return None
+    return os.path.join(THUMBNAIL_DIR, name)
+
+def thumbnail_mimetype(name):
+    ext = name.rsplit('.', 1)[-1]
+    return THUMBNAIL_FORMATS.get(ext, (None, 'application/octet-stream'))[1]
+
+def _load_index():
+    global _index
+    if _index is None:
+        _index = {}
+        if os.path.exists(THUMBNAIL_INDEX_FILE):
+            try:
+                with open(THUMBNAIL_INDEX_FILE, 'r', encoding='utf-8') as f:
+                    _index = json.load(f)
+            except json.JSONDecodeError:
+                _index = {}
+    return _index
+
+def _save_index():
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    tmp_file = THUMBNAIL_INDEX_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(_index, f, ensure_ascii=False)
+    os.replace(tmp_file, THUMBNAIL_INDEX_FILE)
+
+def _variant_key(settings):
+    # Every setting that changes the output bytes is part of the name, since files are served as immutable.
+    return f"{settings['width']}x{settings['height']}q{settings['quality']}.{settings['format']}"
+
+def _lookup(source_url, variant):
+    with index_lock:
+        name = _load_index().get(source_url, {}).get(variant)
+    path = os.path.join(THUMBNAIL_DIR, name) if name else None
+    if path and os.path.exists(path):
+        # Reused by a scrape, so the catalog points at it again: keep it from being evicted.
+        touch_thumbnail(path)
+        return name
+    return None
+
+def _record(source_url, variant, name):
+    with index_lock:
+        index = _load_index()
+        index.setdefault(source_url, {})[variant] = name
+        _save_index()
+
+def fetch_image(url, timeout=15):
+    try:
+        response = requests.get(url, headers=FETCH_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching image {url}: {e}")
+        return None
+
+def render_thumbnail(image_bytes, width, height, fmt, quality):
+    """Crops and resizes image bytes to width x height and encodes them as fmt."""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        thumb = ImageOps.fit(img, (width, height), Image.LANCZOS)
+    out = io.BytesIO()
+    thumb.save(out, THUMBNAIL_FORMATS[fmt][0], quality=quality)
+    return out.getvalue()
+
+def generate_thumbnail(source_url, settings=None):
+    """
+    Returns the file name of the thumbnail for source_url, generating it if needed.
+    Thumbnails are stored content-addressed (hash of the source image bytes), so
+    the same image reached through different URLs is only stored once.
+    """
+    settings = settings or get_thumbnail_settings()
+    variant = _variant_key(settings)
+
+    existing = _lookup(source_url, variant)
+    if existing:
+        return existing
+
+    image_bytes = fetch_image(source_url)
+    if not image_bytes:
+        return None
+
+    digest = hashlib.sha256(image_bytes).hexdigest()[:32]
+    name = f"{digest}-{variant}"
+    path = os.path.join(THUMBNAIL_DIR, name)
+
+    if not os.path.exists(path):
+        try:
+            data = render_thumbnail(image_bytes, settings['width'], settings['height'], settings['format'], settings['quality'])
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            print(f"Error generating thumbnail for {source_url}: {e}")
+            return None
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    _record(source_url, variant, name)
+    return name
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnail')
+        return _executor
+
+def submit_thumbnail(source_url, settings=None):
+    """Queues thumbnail generation on the worker pool. Returns a Future, or None if disabled."""
+    settings = settings or get_thumbnail_settings()
+    if not settings['enabled'] or not source_url or not source_url.startswith('http'):
+        return None
+    return _get_executor(settings['workers']).submit(generate_thumbnail, source_url, settings)
+
+def apply_thumbnail_jobs(jobs):
+    """
+    Waits for queued thumbnail jobs and stores their route on the target entries.
+    jobs is a list of (entry_dict, field_name, future) tuples.
+    """
+    for entry, field, future in jobs:
+        name = None
+        if future is not None:
+            try:
+                name = future.result()
+            except Exception as e:
+                print(f"Thumbnail job failed: {e}")
+        if name:
+            entry[field] = thumbnail_url(name)
+        else:
+            entry.pop(field, None)
+
+    if any(future is not None for _, _, future in jobs):
+        evict_thumbnails()
+
+def touch_thumbnail(path):
+    """Marks a thumbnail as recently used (served or reused) for eviction purposes."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+def evict_thumbnails(max_bytes=None):
+    """
+    Deletes least recently used thumbnails until the cache fits in max_bytes. Files are
+    touched when the backend serves or reuses them, so mtime is the last access time.
+    """
+    if max_bytes is None:
+        max_bytes = get_thumbnail_settings()['max_cache_mb'] * 1024 * 1024
+    if not os.path.isdir(THUMBNAIL_DIR):
+        return 0
+
+    index_name = os.path.basename(THUMBNAIL_INDEX_FILE)
+    files = []
+    total = 0
+    for entry in os.scandir(THUMBNAIL_DIR):
+        if entry.is_file() and entry.name != index_name and not entry.name.endswith('.tmp'):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.name))
+            total += stat.st_size
+
+    if total <= max_bytes:
+        return 0
+
+    evicted = set()
+    for _, size, name in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(THUMBNAIL_DIR, name))
+        except OSError:
+            continue
+        total -= size
+        evicted.add(name)
+
+    with index_lock:
+        index = _load_index()
+        for source_url in list(index):
+            variants = {k: v for k, v in index[source_url].items() if v not in evicted}
+            if variants:
+                index[source_url] = variants
+            else:
+                del index[source_url]
+        _save_index()
+        _evicted_names.update(evicted)
+
+    print(f"Evicted {len(evicted)} thumbnails from cache.")
+    return len(evicted)
+
+def drop_evicted_references(mangas):
+    """
+    Removes cover_thumb fields that point at evicted thumbnails, so the frontend uses the
+    original covers until the next scrape regenerates them. Call before saving the catalog.
+    """
+    with index_lock:
+        if not _evicted_names:
+            return 0
+        evicted_urls = {thumbnail_url(name) for name in _evicted_names}
+        _evicted_names.clear()
+
+    dropped = 0
+    for manga in mangas:
+        if manga.get('cover_thumb') in evicted_urls:
+            del manga['cover_thumb']
+            dropped += 1
+    return dropped
@@ -0,0 +1,350 @@
+from abc import ABC, abstractmethod
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Unit kinds
+LIST_PAGE = 'list_page'
+MANGA_DETAIL = 'manga_detail'
+CHAPTER_PAGES = 'chapter_pages'
+
+# Unit states. 'done' units hold a result that the coordinator has not merged yet.
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+MERGED = 'merged'
+FAILED = 'failed'
+
+DEFAULT_DISTRIBUTED_SETTINGS = {
+    "enabled": False,
+    "backend": "sqlite",
+    # On the scraped_data volume that docker-compose shares between backend and workers.
+    "work_table": os.path.join(os.path.dirname(__file__), '..', 'frontend', 'public', 'scraped_data', 'work_table.sqlite3'),
+    "lease_seconds": 120,
+    "heartbeat_seconds": 30,
+    "max_attempts": 3,
+    "retry_delay_seconds": 60,
+    "merge_interval_seconds": 10,
+    "local_workers": 0
+}
+
+class WorkTable(ABC):
+    """
+    Shared table of scrape units leased to workers.
+
+    A unit is identified by (kind, key); enqueueing a unit that is already pending,
+    leased or waiting to be merged is a no-op. Workers lease units for a limited time
+    and must heartbeat to keep them. Leases that expire (dead worker) are handed out
+    again until max_attempts is reached.
+    """
+    def __init__(self, lease_seconds=120, max_attempts=3, retry_delay_seconds=60):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+
+    @abstractmethod
+    def enqueue(self, kind, key, payload, priority=0, replace_pending=False):
+        """
+        Adds a unit. Returns True if it was added, False if an identical unit is outstanding.
+        With replace_pending, an identical unit that is still pending takes the new payload
+        and the higher of both priorities, and True is returned as well.
+        """
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id):
+        """Leases the next available unit to worker_id. Returns a unit dict or None."""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, unit_id, worker_id):
+        """Extends a lease. Returns False if the worker no longer holds it."""
+        pass
+
+    @abstractmethod
+    def complete(self, unit_id, worker_id, result):
+        """Stores a unit's result. Returns False if the lease was lost and the result discarded."""
+        pass
+
+    @abstractmethod
+    def fail(self, unit_id, worker_id, error):
+        """Releases a unit after an error, scheduling a retry while attempts remain."""
+        pass
+
+    @abstractmethod
+    def claim_results(self, limit=100):
+        """Returns completed units (in state 'merged') and marks them merged."""
+        pass
+
+    @abstractmethod
+    def counts(self):
+        """Returns the number of units in each state."""
+        pass
+
+class SQLiteWorkTable(WorkTable):
+    """WorkTable stored in a SQLite file, shareable by processes or containers on one volume."""
+    FINISHED_RETENTION_SECONDS = 24 * 3600
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS work_units (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            unit_key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL,
+            worker_id TEXT,
+            lease_expires REAL,
+            available_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            updated_at REAL NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS work_units_outstanding
+            ON work_units(kind, unit_key) WHERE state IN ('pending', 'leased', 'done');
+        CREATE INDEX IF NOT EXISTS work_units_state ON work_units(state, available_at);
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        return conn
+
+    @staticmethod
+    def _unit_from_row(row):
+        unit = dict(row)
+        unit['payload'] = json.loads(unit['payload'])
+        unit['result'] = json.loads(unit['result']) if unit['result'] else None
+        return unit
+
+    def enqueue(self, kind, key, payload, priority=0, replace_pending=False):
+        now = time.time()
+        payload_json = json.dumps(payload, ensure_ascii=False)
+        conn = self._connect()
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO work_units (kind, unit_key, payload, priority, state, available_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kind, key, payload_json, priority, PENDING, now, now)
+        )
+        if cur.rowcount == 0 and replace_pending:
+            cur = conn.execute(
+                "UPDATE work_units SET payload = ?, priority = MAX(priority, ?), updated_at = ? "
+                "WHERE kind = ? AND unit_key = ? AND state = ?",
+                (payload_json, priority, now, kind, key, PENDING)
+            )
+        return cur.rowcount == 1
+
+    def lease(self, worker_id):
+        now = time.time()
+        conn = self._transaction()
+        try:
+            # Leases abandoned by dead workers either go back to the pool or give up.
+            conn.execute(
+                "UPDATE work_units SET state = ?, error = 'lease expired', updated_at = ? "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT * FROM work_units "
+                "WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_expires < ?) "
+                "ORDER BY priority DESC, id LIMIT 1",
+                (PENDING, now, LEASED, now)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                "UPDATE work_units SET state = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (LEASED, worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        unit = self._unit_from_row(row)
+        unit.update(state=LEASED, worker_id=worker_id, lease_expires=now + self.lease_seconds, attempts=row['attempts'] + 1)
+        return unit
+
+    def heartbeat(self, unit_id, worker_id):
+        now = time.time()
+        cur = self._connect().execute(
+            "UPDATE work_units SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND state = ?",
+            (now + self.lease_seconds, now, unit_id, worker_id, LEASED)
+        )
+        return cur.rowcount == 1
+
+    def complete(self, unit_id, worker_id, result):
+        cur = self._connect().execute(
+            "UPDATE work_units SET state = ?, result = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND state = ?",
+            (DONE, json.dumps(result, ensure_ascii=False), time.time(), unit_id, worker_id, LEASED)
+        )
+        return cur.rowcount == 1
+
+    def fail(self, unit_id, worker_id, error):
+        now = time.time()
+        self._connect().execute(
+            "UPDATE work_units SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "available_at = ?, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND state = ?",
+            (self.max_attempts, FAILED, PENDING, now + self.retry_delay_seconds, str(error), now, unit_id, worker_id, LEASED)
+        )
+
+    def claim_results(self, limit=100):
+        conn = self._transaction()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM work_units WHERE state = ? ORDER BY id LIMIT ?", (DONE, limit)
+            ).fetchall()
+            now = time.time()
+            conn.executemany(
+                "UPDATE work_units SET state = ?, updated_at = ? WHERE id = ?",
+                [(MERGED, now, row['id']) for row in rows]
+            )
+            # Finished units are kept for a while for inspection, then dropped.
+            conn.execute(
+                "DELETE FROM work_units WHERE state IN (?, ?) AND updated_at < ?",
+                (MERGED, FAILED, now - self.FINISHED_RETENTION_SECONDS)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        claimed = [self._unit_from_row(row) for row in rows]
+        for unit in claimed:
+            unit.update(state=MERGED, updated_at=now)
+        return claimed
+
+    def counts(self):
+        rows = self._connect().execute("SELECT state, COUNT(*) AS n FROM work_units GROUP BY state").fetchall()
+        return {row['state']: row['n'] for row in rows}
+
+class LocalWorkTable(WorkTable):
+    """In-process WorkTable for a single node running worker threads."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self._units = {}
+        self._next_id = 1
+
+    def _outstanding(self, kind, key):
+        return next((u for u in self._units.values()
+                     if u['kind'] == kind and u['unit_key'] == key and u['state'] in (PENDING, LEASED, DONE)), None)
+
+    def enqueue(self, kind, key, payload, priority=0, replace_pending=False):
+        with self._lock:
+            outstanding = self._outstanding(kind, key)
+            if outstanding is not None:
+                if replace_pending and outstanding['state'] == PENDING:
+                    outstanding.update(payload=payload, priority=max(outstanding['priority'], priority),
+                                       updated_at=time.time())
+                    return True
+                return False
+            now = time.time()
+            self._units[self._next_id] = {
+                'id': self._next_id, 'kind': kind, 'unit_key': key, 'payload': payload,
+                'priority': priority, 'state': PENDING, 'worker_id': None, 'lease_expires': None,
+                'available_at': now, 'attempts': 0, 'result': None, 'error': None, 'updated_at': now
+            }
+            self._next_id += 1
+            return True
+
+    def lease(self, worker_id):
+        now = time.time()
+        with self._lock:
+            candidates = []
+            for unit in self._units.values():
+                expired = unit['state'] == LEASED and unit['lease_expires'] < now
+                if expired and unit['attempts'] >= self.max_attempts:
+                    unit.update(state=FAILED, error='lease expired', updated_at=now)
+                elif expired or (unit['state'] == PENDING and unit['available_at'] <= now):
+                    candidates.append(unit)
+            if not candidates:
+                return None
+            unit = min(candidates, key=lambda u: (-u['priority'], u['id']))
+            unit.update(state=LEASED, worker_id=worker_id, lease_expires=now + self.lease_seconds,
+                        attempts=unit['attempts'] + 1, updated_at=now)
+            return dict(unit)
+
+    def _held(self, unit_id, worker_id):
+        unit = self._units.get(unit_id)
+        if unit and unit['worker_id'] == worker_id and unit['state'] == LEASED:
+            return unit
+        return None
+
+    def heartbeat(self, unit_id, worker_id):
+        with self._lock:
+            unit = self._held(unit_id, worker_id)
+            if unit:
+                unit['lease_expires'] = time.time() + self.lease_seconds
+            return unit is not None
+
+    def complete(self, unit_id, worker_id, result):
+        with self._lock:
+            unit = self._held(unit_id, worker_id)
+            if unit:
+                unit.update(state=DONE, result=result, lease_expires=None, updated_at=time.time())
+            return unit is not None
+
+    def fail(self, unit_id, worker_id, error):
+        with self._lock:
+            unit = self._held(unit_id, worker_id)
+            if unit:
+                now = time.time()
+                unit.update(state=FAILED if unit['attempts'] >= self.max_attempts else PENDING,
+                            available_at=now + self.retry_delay_seconds, lease_expires=None,
+                            error=str(error), updated_at=now)
+
+    def claim_results(self, limit=100):
+        with self._lock:
+            done = sorted((u for u in self._units.values() if u['state'] == DONE), key=lambda u: u['id'])[:limit]
+            for unit in done:
+                unit['state'] = MERGED
+            claimed = [dict(unit) for unit in done]
+            # Finished units are dropped right away to keep memory bounded.
+            for unit_id in [u['id'] for u in self._units.values() if u['state'] in (MERGED, FAILED)]:
+                del self._units[unit_id]
+            return claimed
+
+    def counts(self):
+        with self._lock:
+            counts = {}
+            for unit in self._units.values():
+                counts[unit['state']] = counts.get(unit['state'], 0) + 1
+            return counts
+
+def get_distributed_settings(config):
+    settings = dict(DEFAULT_DISTRIBUTED_SETTINGS)
+    settings.update(config.get('distributed', {}))
+    return settings
+
+def create_work_table(settings):
+    kwargs = {
+        'lease_seconds': settings['lease_seconds'],
+        'max_attempts': settings['max_attempts'],
+        'retry_delay_seconds': settings['retry_delay_seconds']
+    }
+    if settings['backend'] == 'local':
+        return LocalWorkTable(**kwargs)
+    if settings['backend'] == 'sqlite':
+        return SQLiteWorkTable(settings['work_table'], **kwargs)
+    raise ValueError(f"Unknown work table backend '{settings['backend']}'")
@@ -0,0 +1,38 @@
+import argparse
+import os
+import socket
+import threading
+
+from config_loader import load_config
+import scheduler
+import work_queue
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape worker for distributed mode.")
+    parser.add_argument('--threads', type=int, default=1, help="Number of worker threads in this process")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="Run the scheduler loop (enqueue cycles and merge results) instead of a worker")
+    args = parser.parse_args()
+
+    settings = work_queue.get_distributed_settings(load_config())
+    if not settings['enabled'] or settings['backend'] != 'sqlite':
+        print("Distributed mode needs 'distributed.enabled' and the 'sqlite' backend in config/settings.json.")
+        return
+
+    if args.coordinator:
+        print("Starting coordinator...")
+        scheduler.run_scraper_loop()
+        return
+
+    table = work_queue.create_work_table(settings)
+    worker_prefix = f"{socket.gethostname()}-{os.getpid()}"
+    threads = []
+    for i in range(args.threads):
+        t = threading.Thread(target=scheduler.run_worker, args=(table, f"{worker_prefix}-{i}"))
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+
+if __name__ == "__main__":
+    main()
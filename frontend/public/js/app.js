@@ -51,6 +51,17 @@ function showDownloadMessage(message, isError = false) {
     }, 5000);
 }
 
+// Falls back from the generated thumbnail to the original cover, then to a placeholder.
+function handleCoverError(img) {
+    if (img.dataset.fallback) {
+        img.src = img.dataset.fallback;
+        img.dataset.fallback = '';
+        return;
+    }
+    img.onerror = null;
+    img.src = 'https://placehold.co/300x450/CCCCCC/666666?text=No+Cover';
+}
+
 // --- API Interaction ---
 
 async function fetchFavoriteMangaUrls() {
@@ -186,10 +197,11 @@ function createMangaCard(manga) {
 
     mangaCard.innerHTML = `
         <img
-            src="${manga.cover}"
+            src="${manga.cover_thumb || manga.cover}"
+            data-fallback="${manga.cover_thumb ? manga.cover : ''}"
             alt="${manga.title}"
             class="w-full h-72 object-cover object-center rounded-t-xl transform group-hover:scale-105 transition-transform duration-300"
-            onerror="this.onerror=null;this.src='https://placehold.co/300x450/CCCCCC/666666?text=No+Cover';"
+            onerror="handleCoverError(this)"
         />
         <button class="favorite-toggle absolute top-3 right-3 bg-gray-900 bg-opacity-70 p-2 rounded-full cursor-pointer hover:scale-110 transition-transform duration-200" data-manga-url="${cleanedMangaUrl}">
             <i class="${favoriteIconClass} fa-star text-2xl"></i>
@@ -293,10 +305,11 @@ function renderChaptersPage() {
 
     mangaDetails.innerHTML = `
         <img
-            src="${selectedManga.cover}"
+            src="${selectedManga.cover_thumb || selectedManga.cover}"
+            data-fallback="${selectedManga.cover_thumb ? selectedManga.cover : ''}"
             alt="${selectedManga.title}"
             class="w-48 h-72 object-cover object-center rounded-lg shadow-md md:mr-8 mb-6 md:mb-0 flex-shrink-0"
-            onerror="this.onerror=null;this.src='https://placehold.co/300x450/CCCCCC/666666?text=No+Cover';"
+            onerror="handleCoverError(this)"
         />
         <div class="flex-grow">
             <h2 class="text-4xl font-extrabold text-blue-400 mb-3">${selectedManga.title || 'N/A'}</h2>
@@ -14,6 +14,37 @@ const PYTHON_SCRAPER_URL = 'http://localhost:5000';
 // Middleware to parse JSON request bodies
 app.use(express.json());
 
+// Thumbnails are proxied to the backend rather than served from disk: the backend sets the
+// long-lived cache headers and records each access for its cache eviction. Mounted before the
+// static middleware so nothing under public/thumbnails (e.g. its index.json) is exposed.
+app.use('/thumbnails', async (req, res) => {
+    try {
+        // Pass the browser's validators on so the backend can answer 304 Not Modified.
+        const headers = {};
+        for (const header of ['if-none-match', 'if-modified-since']) {
+            if (req.headers[header]) headers[header] = req.headers[header];
+        }
+        const response = await fetch(`${PYTHON_SCRAPER_URL}/thumbnails${req.path}`, { headers });
+        res.status(response.status);
+        for (const header of ['content-type', 'cache-control', 'etag', 'last-modified']) {
+            const value = response.headers.get(header);
+            if (value) res.setHeader(header, value);
+        }
+        res.send(Buffer.from(await response.arrayBuffer()));
+    } catch (error) {
+        console.error("Error fetching thumbnail from Python scraper:", error);
+        res.status(502).json({ message: "Thumbnail unavailable." });
+    }
+});
+
+// The distributed work table (and its WAL files) lives under public/scraped_data; never serve it.
+app.use((req, res, next) => {
+    if (/\.sqlite3(-wal|-shm|-journal)?$/.test(req.path)) {
+        return res.status(404).end();
+    }
+    next();
+});
+
 // Serve static files from the 'public' directory
 app.use(express.static(path.join(__dirname, 'public')));
 